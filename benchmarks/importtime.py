@@ -0,0 +1,107 @@
+"""Import time benchmark of the `wtforms_pydantic` package.
+
+Usage::
+
+    python benchmarks/importtime.py --output imports.json
+    python benchmarks/importtime.py --compare imports.json
+
+Each run imports the package in a fresh interpreter with
+`python -X importtime`. The results are written as JSON: the median
+cumulative import time of the package, in microseconds, and of each of
+its modules and of its direct dependencies.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+
+try:
+    from benchmarks.run import revision
+except ImportError:
+    from run import revision
+
+
+PACKAGE = 'wtforms_pydantic'
+
+
+def import_times(module=PACKAGE):
+    """Returns the cumulative import times of the modules imported by
+    one import of `module`, in microseconds, with their nesting level.
+    """
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        check=True, capture_output=True, text=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        times[name] = (int(cumulative), level)
+        if level == 0:
+            if name == module:
+                return times
+            # An import of the interpreter startup: start over.
+            times = {}
+    raise RuntimeError(f'{module} was not imported.')
+
+
+def run(repeat):
+    samples = {}
+    for _ in range(repeat):
+        for name, (cumulative, level) in import_times().items():
+            if name.startswith(PACKAGE) or level <= 1:
+                samples.setdefault(name, []).append(cumulative)
+    modules = {
+        name: round(statistics.median(timings))
+        for name, timings in samples.items()
+    }
+    return {
+        'meta': {
+            'revision': revision(),
+            'python': platform.python_version(),
+            'repeat': repeat,
+        },
+        'total_us': modules.pop(PACKAGE),
+        'modules': dict(
+            sorted(modules.items(), key=lambda item: -item[1])),
+    }
+
+
+def compare(baseline, report):
+    """Prints the import times against a previous report."""
+    print(f"{'total':<40} {baseline['total_us']:>10} "
+          f"{report['total_us']:>10}")
+    for name, cumulative in report['modules'].items():
+        previous = baseline['modules'].get(name)
+        if previous is not None:
+            print(f'{name:<40} {previous:>10} {cumulative:>10}')
+    for name in baseline['modules'].keys() - report['modules'].keys():
+        print(f"{name:<40} {baseline['modules'][name]:>10} {'-':>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help='Write the JSON report there.')
+    parser.add_argument('--compare', help='A previous JSON report.')
+    args = parser.parse_args(argv)
+
+    report = run(args.repeat)
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(report, fp, indent=2)
+    if args.compare:
+        with open(args.compare) as fp:
+            compare(json.load(fp), report)
+    elif not args.output:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Synthetic models exercising the different form building paths.
+"""
+
+import datetime
+import enum
+import typing
+import pydantic
+
+
+SCALARS = (
+    (str, 'value'),
+    (int, '42'),
+    (float, '4.2'),
+    (bool, 'y'),
+    (datetime.date, '2020-11-02'),
+)
+
+
+Colors = enum.Enum(
+    'Colors', {f'color{i}': f'Color #{i}' for i in range(100)})
+
+
+Sizes = typing.Literal[tuple(f'size{i}' for i in range(50))]
+
+
+def wide_flat(width=200):
+    fields, formdata = {}, {}
+    for i in range(width):
+        type_, raw = SCALARS[i % len(SCALARS)]
+        fields[f'field{i}'] = (type_, ...)
+        formdata[f'field{i}'] = [raw]
+    return pydantic.create_model('WideFlat', **fields), formdata
+
+
+def choices(width=100):
+    fields, formdata = {}, {}
+    for i in range(width):
+        if i % 2:
+            fields[f'field{i}'] = (Colors, ...)
+            formdata[f'field{i}'] = [f'color{i}']
+        else:
+            fields[f'field{i}'] = (Sizes, ...)
+            formdata[f'field{i}'] = [f'size{i % 50}']
+    return pydantic.create_model('Choices', **fields), formdata
+
+
+def multiple(width=50):
+    fields, formdata = {}, {}
+    for i in range(width):
+        fields[f'field{i}'] = (typing.List[Colors], ...)
+        formdata[f'field{i}'] = [f'color{j}' for j in range(i, i + 10)]
+    return pydantic.create_model('Multiple', **fields), formdata
+
+
+def validators(width=50, roots=5):
+
+    def check(cls, value, values):
+        if 'field0' in values and not value.startswith('v'):
+            raise ValueError('must start with a v')
+        return value
+
+    def root(cls, values):
+        if not values.get('field0'):
+            raise ValueError('field0 is mandatory')
+        return values
+
+    fields, formdata, namespace = {}, {}, {}
+    for i in range(width):
+        fields[f'field{i}'] = (str, ...)
+        formdata[f'field{i}'] = ['value']
+        namespace[f'check{i}'] = pydantic.validator(
+            f'field{i}', allow_reuse=True)(check)
+    for i in range(roots):
+        namespace[f'pre{i}'] = pydantic.root_validator(
+            pre=True, allow_reuse=True)(root)
+        namespace[f'post{i}'] = pydantic.root_validator(
+            allow_reuse=True)(root)
+    return pydantic.create_model(
+        'Validators', __validators__=namespace, **fields), formdata
+
+
+MODELS = {
+    'wide_flat': wide_flat,
+    'choices': choices,
+    'multiple': multiple,
+    'validators': validators,
+}
@@ -0,0 +1,181 @@
+"""Benchmarks for the form construction, binding, processing and
+validation of the synthetic models in `benchmarks/models.py`.
+
+Usage::
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --compare baseline.json
+
+The results are written as JSON: one entry per model and phase, with
+the timings in microseconds and the memory allocated during one run.
+The construction entries also report the memory retained per compiled
+field.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import pydantic
+import wtforms
+import wtforms_pydantic
+from wtforms_pydantic import Form, compile_model
+from wtforms_pydantic.blueprint import blueprints, model_fields
+
+try:
+    from benchmarks.models import MODELS
+except ImportError:
+    from models import MODELS
+
+
+class FormData(dict):
+
+    def getlist(self, key):
+        return self[key]
+
+
+def phases(model, formdata):
+    """Yields the benchmarked phases as (name, setup, run) triplets.
+    `setup` returns the argument given to `run`.
+    """
+
+    def construct(_):
+        blueprints.clear()
+        compile_model(model)
+
+    def bound(_=None):
+        return Form.from_model(model)
+
+    def processed(_=None):
+        form = bound()
+        form.process(formdata)
+        return form
+
+    yield 'construction', lambda: None, construct
+    yield 'binding', lambda: compile_model(model), bound
+    yield 'processing', bound, lambda form: form.process(formdata)
+    yield 'validation', processed, lambda form: form.validate()
+
+
+def measure(setup, run, repeat):
+    timings = []
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        run(arg)
+        timings.append((time.perf_counter() - start) * 1e6)
+
+    arg = setup()
+    tracemalloc.start()
+    try:
+        run(arg)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'min_us': round(min(timings), 2),
+        'median_us': round(statistics.median(timings), 2),
+        'mean_us': round(statistics.mean(timings), 2),
+        'retained_bytes': current,
+        'peak_bytes': peak,
+    }
+
+
+def field_memory(model):
+    """Returns the memory retained by a compiled field, in bytes.
+
+    The shared type resolutions and metadata are warmed up first: this
+    is the cost of one more model using them.
+    """
+    model_fields(model)
+    tracemalloc.start()
+    try:
+        fields = model_fields(model)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(current / len(fields))
+
+
+def revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names, repeat):
+    results = []
+    for name in names:
+        model, formdata = MODELS[name]()
+        formdata = FormData(formdata)
+        for phase, setup, func in phases(model, formdata):
+            entry = {
+                'model': name,
+                'phase': phase,
+                'fields': len(model.__fields__),
+                **measure(setup, func, repeat),
+            }
+            if phase == 'construction':
+                entry['bytes_per_field'] = field_memory(model)
+            results.append(entry)
+    return {
+        'meta': {
+            'revision': revision(),
+            'python': platform.python_version(),
+            'pydantic': pydantic.VERSION,
+            'wtforms': wtforms.__version__,
+            'wtforms_pydantic': wtforms_pydantic.__version__,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline, report):
+    """Prints the median timing ratios against a previous report."""
+    before = {
+        (entry['model'], entry['phase']): entry
+        for entry in baseline['results']
+    }
+    for entry in report['results']:
+        previous = before.get((entry['model'], entry['phase']))
+        if previous is None:
+            continue
+        ratio = entry['median_us'] / previous['median_us']
+        print(f"{entry['model']:<12} {entry['phase']:<14} "
+              f"{previous['median_us']:>12.1f} {entry['median_us']:>12.1f} "
+              f"{ratio:>7.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument(
+        '--model', action='append', choices=sorted(MODELS),
+        help='Only run the given model(s).')
+    parser.add_argument('--output', help='Write the JSON report there.')
+    parser.add_argument('--compare', help='A previous JSON report.')
+    args = parser.parse_args(argv)
+
+    report = run(args.model or list(MODELS), args.repeat)
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(report, fp, indent=2)
+    if args.compare:
+        with open(args.compare) as fp:
+            compare(json.load(fp), report)
+    elif not args.output:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,26 +5,76 @@ __email__ = 'ck@novareto.de'
 __version__ = '0.1.0'
 
 
+import importlib
 import pydantic
+import wtforms.fields
 import wtforms.form
-from typing import Type, Iterable, Optional
-from wtforms_pydantic.field import Field
+from typing import (
+    Type, Iterable, Iterator, Optional, Any, Tuple, TYPE_CHECKING)
+from wtforms_pydantic.field import Field, FieldValidator
+from wtforms_pydantic.converters import register_converter
+from wtforms_pydantic.blueprint import (
+    Blueprint, BlueprintCache, blueprints, model_fields, compile_model,
+    compile_models)
+from wtforms_pydantic.validation import (
+    ValidationContext, FieldResult, root_validator_names,
+    validate_fields_only)
+from wtforms_pydantic._fields import ModelFormField
+from wtforms_pydantic.instrument import Tracer, tracer_var, trace
+from wtforms_pydantic.asynchronous import (
+    async_validator, run_async_validators)
+from wtforms_pydantic.dependencies import (
+    TrackingValues, depends, dependency_graph)
 
+if TYPE_CHECKING:  # pragma: no cover
+    from wtforms_pydantic.batch import BatchResult
 
-def model_fields(model, include=None, exclude=None) -> dict:
-    if not include:
-        include = frozenset(model.__fields__.keys())
-    if not exclude:
-        exclude = set()
 
-    return {
-        name: Field(field) for name, field in model.__fields__.items()
-        if name in include and name not in exclude
-    }
+# Optional parts, imported on first access.
+lazy_exports = {
+    'BatchResult': 'wtforms_pydantic.batch',
+    'validate_records': 'wtforms_pydantic.batch',
+    'validate_parallel': 'wtforms_pydantic.batch',
+    'PayloadTooLarge': 'wtforms_pydantic.stream',
+    'LazyForm': 'wtforms_pydantic.lazy',
+}
+
+__all__ = [
+    'Form', 'Field', 'Blueprint', 'BlueprintCache', 'blueprints',
+    'model_fields', 'compile_model', 'compile_models', 'register_converter',
+    'ValidationContext', 'FieldResult', 'Tracer', 'async_validator',
+    'depends', *lazy_exports,
+]
+
+
+def __getattr__(name):
+    module = lazy_exports.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = globals()[name] = getattr(importlib.import_module(module), name)
+    return value
+
+
+def clear_errors(field):
+    if isinstance(field, wtforms.fields.FormField):
+        field.form.form_errors = []
+        for subfield in field.form:
+            clear_errors(subfield)
+    else:
+        field.errors = []
 
 
 class Form(wtforms.form.BaseForm):
     model: Optional[Type[pydantic.BaseModel]] = None
+    context: Optional[ValidationContext] = None
+    fail_fast: bool = False
+    single_pass: bool = False
+    max_errors: Optional[int] = None
+    max_field_values: Optional[int] = None
+    max_value_size: Optional[int] = None
+    max_payload_size: Optional[int] = None
+    validated: Optional[dict] = None
+    tracked: Optional[Tuple[dict, dict]] = None
 
     def __init__(self, *args, **kwargs):
         self.form_errors = []  # this exists in 3.0a1
@@ -36,28 +86,295 @@ class Form(wtforms.form.BaseForm):
         return cls(fields)
 
     @classmethod
-    def from_model(cls, model: Type[pydantic.BaseModel], **kwargs):
-        form = cls.from_fields(model_fields(model, **kwargs))
-        form.model = model
+    def from_blueprint(cls, blueprint: Blueprint, **kwargs):
+        with trace(tracer_var.get(), 'bind'):
+            form = cls(blueprint.unbound, **kwargs)
+        form.model = blueprint.model
         return form
 
-    def validate(self):
-        if not super().validate():
-            return False
+    @classmethod
+    def from_model(cls, model: Type[pydantic.BaseModel],
+                   include=None, exclude=None, **kwargs):
+        return cls.from_blueprint(
+            compile_model(model, include=include, exclude=exclude), **kwargs)
+
+    @classmethod
+    def validate_many(
+            cls, model: Type[pydantic.BaseModel], records: Iterable[Any],
+            parallel: bool = False, chunksize: int = 500,
+            workers: Optional[int] = None, executor=None,
+            **kwargs) -> Iterator['BatchResult']:
+        """Validates many records against a model, lazily.
+
+        A single form is bound and reused for all the records, yielding
+        for each a `BatchResult` with the errors it would get in a form.
+        In `parallel` mode, the records are validated by chunks in a
+        process pool, or in the given `executor`.
+        """
+        from wtforms_pydantic.batch import validate_records, validate_parallel
+
+        if parallel:
+            return validate_parallel(
+                cls, model, records, chunksize=chunksize, workers=workers,
+                executor=executor, **kwargs)
+        return validate_records(cls.from_model(model, **kwargs), records)
+
+    @property
+    def error_budget(self) -> Optional[int]:
+        return 1 if self.fail_fast else self.max_errors
+
+    def process(self, *args, **kwargs):
+        with trace(tracer_var.get(), 'process'):
+            super().process(*args, **kwargs)
+
+    def process_stream(self, pairs: Iterable[Tuple[str, Any]], **kwargs):
+        """Processes the form out of a stream of `(name, value)` pairs.
+
+        Only the values of the form fields are kept, within the
+        `max_field_values`, `max_value_size` and `max_payload_size`
+        limits of the form: `PayloadTooLarge` is raised as soon as one
+        is exceeded.
+        """
+        from wtforms_pydantic.stream import ingest
+
+        formdata = ingest(
+            (self._prefix + name for name in self._fields), pairs,
+            max_field_values=self.max_field_values,
+            max_value_size=self.max_value_size,
+            max_payload_size=self.max_payload_size)
+        self.process(formdata, **kwargs)
+
+    def validate(self, extra_validators=None):
+        """Validates the form.
+
+        The form data is gathered once into a `ValidationContext`,
+        shared by the field validators and the root validators.
+
+        With `max_errors`, or `fail_fast` (one error), the validation
+        stops once as many fields or root validators failed.
+
+        In `single_pass` mode, the pydantic validation of the fields runs
+        in one `pydantic.validate_model` pass once the WTForms validators
+        ran, its errors being mapped back onto the fields. As with
+        pydantic, the validators then see the `values` of the fields
+        validated before theirs, not the whole form data.
+        """
+        context = ValidationContext(
+            self.data, max_errors=self.error_budget,
+            single_pass=self.single_pass and self.model is not None)
+        return self.run_validation(context, extra_validators)
 
+    def revalidate(self, extra_validators=None):
+        """Validates the form again, after a new processing.
+
+        Only the fields whose data changed since the last `revalidate`
+        and the fields whose validators depend on them are validated,
+        the others keeping their errors and coerced values. The root
+        validators run again if anything changed. The dependencies are
+        learnt from the `values` the validators read. Any other
+        validation of the form makes the next `revalidate` a full one.
+        """
+        if self.model is None:
+            return self.validate(extra_validators)
+
+        data = self.data
+        context = ValidationContext(
+            TrackingValues(data), graph=dependency_graph(self.model),
+            max_errors=self.error_budget)
+        if self.tracked is not None:
+            previous, coerced = self.tracked
+            changed = [
+                name for name, value in data.items()
+                if name not in previous or previous[name] != value
+            ]
+            if not changed:
+                return self.validated is not None
+            context.only = context.graph.affected(changed, data)
+            for name, value in coerced.items():
+                if name not in context.only:
+                    context.values[name] = context.coerced[name] = value
+
+        success = self.run_validation(context, extra_validators)
+        if not context.exhausted:
+            # Fields skipped once the error budget is spent are neither
+            # failed nor coerced: the next run must validate them all.
+            self.tracked = data, context.coerced
+        return success
+
+    async def async_validate(self, extra_validators=None):
+        """Validates the form, running the async validators of the model.
+
+        The fields are validated as by `validate`, then the coroutines
+        declared with `async_validator` run concurrently for the fields
+        that are valid so far, before the root validators.
+        """
+        context = ValidationContext(
+            self.data, max_errors=self.error_budget)
+        with trace(context.tracer, 'validate'):
+            success = self.validate_context(context, extra_validators)
+            if self.model is not None and not context.exhausted:
+                with trace(context.tracer, 'validate.async'):
+                    if not await run_async_validators(self, context):
+                        success = False
+            return self.complete_validation(context, success)
+
+    def run_validation(self, context, extra_validators=None):
+        with trace(context.tracer, 'validate'):
+            success = self.validate_context(context, extra_validators)
+            return self.complete_validation(context, success)
+
+    def validate_context(self, context, extra_validators=None) -> bool:
+        self.form_errors = []
+        self.validated = None
+        self.tracked = None
+        self.context = context
+        try:
+            with trace(context.tracer, 'validate.fields'):
+                success = self.validate_fields(extra_validators)
+            if context.submitted is not None:
+                with trace(context.tracer, 'validate.model'):
+                    if not self.validate_submitted(context):
+                        success = False
+        finally:
+            self.context = None
+        return success
+
+    def complete_validation(self, context, success: bool) -> bool:
+        if not success:
+            return False
         if self.model is not None:
-            data = self.data
-            for validator in self.model.__pre_root_validators__:
-                try:
-                    validator(self.model, data)
-                except (ValueError, TypeError, AssertionError) as exc:
-                    self.form_errors.append(str(exc))
-
-            for skip, validator in self.model.__post_root_validators__:
-                try:
-                    validator(self.model, data)
-                except (ValueError, TypeError, AssertionError) as exc:
-                    self.form_errors.append(str(exc))
-
-            return not len(self.form_errors)
+            with trace(context.tracer, 'validate.root'):
+                values = self.validate_root(
+                    context.values, max_errors=context.max_errors)
+            if self.form_errors:
+                return False
+        else:
+            values = context.values
+        self.validated = {name: values[name] for name in context.coerced}
         return True
+
+    def validate_submitted(self, context) -> bool:
+        """Validates the data collected in the `single_pass` mode,
+        reporting the errors as the field validators would.
+        """
+        values, errors = validate_fields_only(self.model, context.submitted)
+        success = True
+        for name in context.submitted:
+            message = errors.get(name)
+            if message is None:
+                if name in values:
+                    context.values[name] = context.coerced[name] = \
+                        values[name]
+            elif name not in context.lenient and not context.exhausted:
+                field = self[name]
+                if isinstance(field, ModelFormField):
+                    field.form.form_errors.append(message)
+                else:
+                    field.errors.append(message)
+                context.failures += 1
+                success = False
+        return success
+
+    def validate_field(
+            self, name: str, dependencies: Iterable[str] = ()) -> FieldResult:
+        """Validates a single field, for live validation.
+
+        Only the field and its `dependencies`, validated first, are
+        validated: the values seen by the pydantic validators are
+        limited to them. The form errors are left untouched and the root
+        validators are not run: their names are reported as `skipped`.
+        """
+        fields = [(key, self[key]) for key in (*dependencies, name)]
+        self.tracked = None
+        self.context = ValidationContext(
+            {key: field.data for key, field in fields})
+        try:
+            for key, field in fields:
+                field.validate(self)
+        finally:
+            self.context = None
+
+        errors = {key: field.errors for key, field in fields if field.errors}
+        skipped = root_validator_names(self.model) if self.model else ()
+        return FieldResult(not errors, errors, skipped)
+
+    def validate_fields(self, extra_validators=None, fields=None) -> bool:
+        """Validates the fields, or those of the context `only` set.
+
+        Fields that are not validated again keep their errors. Fields
+        whose validation stopped early, as optional fields left empty,
+        are coerced all the same.
+        """
+        context = self.context
+        if context is not None:
+            only, tracer = context.only, context.tracer
+        else:
+            only, tracer = None, None
+        success = True
+        if fields is None:
+            fields = self._fields.items()
+        for name, field in fields:
+            if only is not None and name not in only:
+                if field.errors:
+                    success = False
+                continue
+            if context is not None and context.exhausted:
+                clear_errors(field)
+                continue
+            if extra_validators is not None and name in extra_validators:
+                extra = extra_validators[name]
+            else:
+                extra = ()
+            if tracer is None:
+                valid = field.validate(self, extra)
+            else:
+                with tracer.span(f'field:{name}'):
+                    valid = field.validate(self, extra)
+            if not valid:
+                success = False
+                if context is not None:
+                    context.failures += 1
+            elif context is not None and not context.reached(name):
+                for validator in field.validators:
+                    if isinstance(validator, FieldValidator):
+                        validator.coerce(self, field)
+        return success
+
+    def to_model(self) -> pydantic.BaseModel:
+        """Returns the model instance of a validated form.
+
+        The instance is built out of the values coerced during the
+        validation, without validating them again.
+        """
+        if self.model is None:
+            raise TypeError('This form is not bound to a model.')
+        if self.validated is None:
+            raise ValueError('The form has not been successfully validated.')
+        return self.model.construct(
+            _fields_set=set(self.validated), **self.validated)
+
+    def validate_root(self, data, max_errors: Optional[int] = None):
+        """Runs the root validators of the model, returning their values.
+
+        Errors are appended to the `form_errors`. As with pydantic, the
+        post root validators with `skip_on_failure` are skipped after an
+        error. No validator runs once `max_errors` errors are reached.
+        """
+        tracer = tracer_var.get()
+        validators = (
+            *((False, validator)
+              for validator in self.model.__pre_root_validators__),
+            *self.model.__post_root_validators__,
+        )
+        for skip, validator in validators:
+            if skip and self.form_errors:
+                continue
+            if max_errors is not None and len(self.form_errors) >= max_errors:
+                break
+            try:
+                with trace(tracer, f'root:{validator.__name__}'):
+                    data = validator(self.model, data)
+            except (ValueError, TypeError, AssertionError) as exc:
+                self.form_errors.append(str(exc))
+
+        return data
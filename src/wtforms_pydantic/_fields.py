@@ -1,6 +1,173 @@
-from wtforms import widgets, SelectMultipleField
+from wtforms import (
+    widgets, SelectField, SelectMultipleField, FormField, FieldList)
+from wtforms.utils import unset_value
+from wtforms.validators import ValidationError
+from wtforms_pydantic.choices import (
+    ChoiceTable, ChoiceSelect, ChoiceListWidget, field_table)
 
 
 class MultiCheckboxField(SelectMultipleField):
-    widget = widgets.ListWidget(prefix_label=False)
+    widget = ChoiceListWidget(prefix_label=False)
     option_widget = widgets.CheckboxInput()
+
+
+class EnumChoices:
+    """Mixin for the select fields of an enum choice table.
+
+    When built out of the choices of its coerce table, the field shares
+    the frozen choices instead of copying them, and checks the
+    membership of its data through the table members. The shared
+    choices are only copied into a list once read through `choices`,
+    so that they can be changed in place: the widgets and validation
+    of the field don't read them.
+    """
+
+    def __init__(self, label=None, validators=None, coerce=str,
+                 choices=None, validate_choice=True, **kwargs):
+        table = getattr(coerce, '__self__', None)
+        shared = isinstance(table, ChoiceTable) and choices is table.choices
+        super().__init__(
+            label, validators, coerce=coerce,
+            choices=None if shared else choices,
+            validate_choice=validate_choice, **kwargs)
+        if shared:
+            self._choices = table.frozen
+
+    @property
+    def choices(self):
+        if isinstance(self._choices, tuple):
+            self._choices = list(self._choices)
+        return self._choices
+
+    @choices.setter
+    def choices(self, choices):
+        self._choices = choices
+
+
+class EnumSelectField(EnumChoices, SelectField):
+    widget = ChoiceSelect()
+
+    def pre_validate(self, form):
+        table = field_table(self)
+        if table is None:
+            return super().pre_validate(form)
+        if self.validate_choice and self.data not in table.members:
+            raise ValidationError(self.gettext("Not a valid choice."))
+
+
+class EnumMultiCheckboxField(EnumChoices, MultiCheckboxField):
+
+    def pre_validate(self, form):
+        table = field_table(self)
+        if table is None:
+            return super().pre_validate(form)
+        if not self.validate_choice or not self.data:
+            return
+        unacceptable = [
+            str(member) for member in self.data
+            if member not in table.members
+        ]
+        if unacceptable:
+            raise ValidationError(
+                self.ngettext(
+                    "'%(value)s' is not a valid choice for this field.",
+                    "'%(value)s' are not valid choices for this field.",
+                    len(unacceptable),
+                )
+                % dict(value="', '".join(unacceptable))
+            )
+
+
+def blank(field) -> bool:
+    """Tells whether nothing was input in the field nor its sub-fields.
+    """
+    if isinstance(field, FormField):
+        return all(blank(subfield) for subfield in field.form)
+    if isinstance(field, FieldList):
+        return all(blank(entry) for entry in field.entries)
+    return not any(field.raw_data or ())
+
+
+class ModelFormField(FormField):
+    """A sub-form of a nested model.
+
+    Once the sub-form is valid, the `validator` of the field, if any,
+    runs against the `model_data` and reports to the sub-form errors.
+    """
+
+    def __init__(self, form_class, validator=None, **kwargs):
+        super().__init__(form_class, **kwargs)
+        self.validator = validator
+
+    @property
+    def model_data(self):
+        if self.form.validated is not None:
+            return self.form.to_model()
+        return self.form.data
+
+    def validate(self, form, extra_validators=()):
+        if not super().validate(form, extra_validators):
+            return False
+        if self.validator is not None:
+            try:
+                self.validator(form, self)
+            except ValidationError as exc:
+                self.form.form_errors.append(exc.args[0])
+                return False
+        return True
+
+
+class ModelFieldList(FieldList):
+    """A list of sub-forms of a nested model.
+
+    The validators of the list only run once all the entries are valid.
+    A `scalar` list holds at most one entry, standing for an optional
+    sub-form: it is used for optional nested models, that may be left
+    out, and for recursive models, that can't be expanded. Its entry
+    is `blank` when it has no object data and nothing was input in it:
+    the list data is then `None` and the entry is not validated.
+    """
+
+    def __init__(self, unbound_field, scalar=False, **kwargs):
+        if scalar:
+            kwargs['max_entries'] = 1
+        super().__init__(unbound_field, **kwargs)
+        self.scalar = scalar
+
+    def process(self, formdata, data=unset_value, **kwargs):
+        if data is None:
+            data = ()
+        elif self.scalar and data is not unset_value \
+                and not isinstance(data, (list, tuple)):
+            data = [data]
+        super().process(formdata, data, **kwargs)
+
+    @property
+    def blank(self) -> bool:
+        return self.scalar and not self.object_data and blank(self)
+
+    @property
+    def data(self):
+        if self.scalar:
+            return None if self.blank else self.entries[0].data
+        return [entry.data for entry in self.entries]
+
+    @property
+    def model_data(self):
+        if self.scalar:
+            return None if self.blank else self.entries[0].model_data
+        return [entry.model_data for entry in self.entries]
+
+    def validate(self, form, extra_validators=()):
+        self.errors = []
+        for entry in () if self.blank else self.entries:
+            entry.validate(form)
+            self.errors.append(entry.errors)
+
+        if any(self.errors):
+            return False
+
+        self.errors = []
+        chain = (*self.validators, *extra_validators)
+        self._run_validation_chain(form, chain)
+        return not self.errors
@@ -0,0 +1,73 @@
+import weakref
+from typing import Dict, Tuple, Callable
+
+
+def async_validator(*fields: str):
+    """Declares a coroutine of the model validating some fields::
+
+        class Account(pydantic.BaseModel):
+            email: str
+
+            @async_validator('email')
+            async def unique_email(cls, v, values):
+                if await exists(v):
+                    raise ValueError('This email is already registered.')
+
+    The coroutines are run by `Form.async_validate`, concurrently, for
+    the fields that passed their synchronous validation. They get the
+    coerced value and the `values` of the form; what they return is
+    ignored.
+    """
+    def declare(func):
+        func.__form_async__ = fields
+        return func
+    return declare
+
+
+AsyncValidators = Dict[str, Tuple[Callable, ...]]
+
+registries = weakref.WeakKeyDictionary()
+
+
+def async_validators(model) -> AsyncValidators:
+    validators = registries.get(model)
+    if validators is None:
+        found = {}
+        for klass in reversed(model.__mro__):
+            for func in vars(klass).values():
+                for name in getattr(func, '__form_async__', ()):
+                    found.setdefault(name, []).append(func)
+        validators = registries[model] = {
+            name: tuple(funcs) for name, funcs in found.items()}
+    return validators
+
+
+async def run_async_validators(form, context) -> bool:
+    """Runs the async validators of the model concurrently.
+
+    The errors are appended to the fields in the order of the form
+    fields and, for a field, of the validators, whatever the order of
+    completion.
+    """
+    import asyncio
+
+    validators = async_validators(form.model)
+    calls = [
+        (field, func(form.model, context.coerced[name], context.values))
+        for name, field in form._fields.items()
+        if name in context.coerced and not field.errors
+        for func in validators.get(name, ())
+    ]
+    if not calls:
+        return True
+
+    results = await asyncio.gather(
+        *(call for field, call in calls), return_exceptions=True)
+    success = True
+    for (field, call), result in zip(calls, results):
+        if isinstance(result, (ValueError, TypeError, AssertionError)):
+            field.errors.append(str(result))
+            success = False
+        elif isinstance(result, BaseException):
+            raise result
+    return success
@@ -0,0 +1,108 @@
+import collections
+import concurrent.futures
+import itertools
+import os
+from typing import (
+    Dict, List, Optional, NamedTuple, Iterable, Iterator, Any, Tuple)
+
+
+class RecordData(dict):
+    """Exposes a flat record as WTForms form data.
+
+    `None` values are considered as missing, sequences as multiple
+    values, everything else as a single value.
+    """
+
+    def __init__(self, record):
+        super().__init__(
+            (key, value) for key, value in record.items()
+            if value is not None)
+
+    def getlist(self, key) -> list:
+        value = self[key]
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return list(value)
+        return [value]
+
+
+class BatchResult(NamedTuple):
+    index: int
+    errors: Dict[str, List[str]]
+    form_errors: List[str]
+    values: Optional[Dict[str, Any]] = None
+
+    @property
+    def valid(self) -> bool:
+        return self.values is not None
+
+
+def validate_records(
+        form, records: Iterable[Any], start: int = 0) -> Iterator[BatchResult]:
+    """Validates each record with the given form, yielding the results.
+
+    The form is reused from one record to the next. Records providing
+    a `getlist` method are processed as form data, other mappings are
+    wrapped in a `RecordData`.
+    """
+    for index, record in enumerate(records, start):
+        if not hasattr(record, 'getlist'):
+            record = RecordData(record)
+        form.process(record)
+        if form.validate():
+            yield BatchResult(index, {}, [], form.validated)
+        else:
+            errors = form.errors
+            errors.pop(None, None)
+            yield BatchResult(index, errors, list(form.form_errors))
+
+
+def chunked(records: Iterable[Any], size: int) -> Iterator[Tuple[int, list]]:
+    records = iter(records)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(records, size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def validate_chunk(form_class, model, options, start, records):
+    """Worker side of `validate_parallel`.
+
+    The blueprint is compiled once per worker process and cached.
+    """
+    form = form_class.from_model(model, **options)
+    return list(validate_records(form, records, start))
+
+
+def validate_parallel(
+        form_class, model, records: Iterable[Any], chunksize: int = 500,
+        workers: Optional[int] = None, executor=None,
+        **options) -> Iterator[BatchResult]:
+    """Validates the records by chunks in a pool of processes.
+
+    The results are yielded in the order of the records. Only a few
+    chunks per worker are submitted in advance, so the records are
+    consumed as the results are. The form class and the model must be
+    importable by the workers: they are sent by reference.
+    """
+    workers = workers or os.cpu_count() or 1
+    owned = executor is None
+    if owned:
+        executor = concurrent.futures.ProcessPoolExecutor(workers)
+
+    pending = collections.deque()
+    try:
+        for start, chunk in chunked(records, chunksize):
+            pending.append(executor.submit(
+                validate_chunk, form_class, model, options, start, chunk))
+            if len(pending) > 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown()
@@ -0,0 +1,279 @@
+import pydantic
+import threading
+import weakref
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import (
+    Type, Dict, Tuple, Optional, FrozenSet, Mapping, NamedTuple, List,
+    Callable, Iterable)
+from wtforms.fields.core import UnboundField
+from wtforms_pydantic.field import Field
+from wtforms_pydantic.instrument import tracer_var, trace
+
+
+def model_fields(model, include=None, exclude=None) -> dict:
+    if not include:
+        include = frozenset(model.__fields__.keys())
+    if not exclude:
+        exclude = set()
+
+    return {
+        name: Field(field) for name, field in model.__fields__.items()
+        if name in include and name not in exclude
+    }
+
+
+def fingerprint(model) -> tuple:
+    """Returns what the blueprints of a model depend on, changing with
+    its fields, as after `update_forward_refs`.
+    """
+    return tuple(
+        (name, field.outer_type_, field.required)
+        for name, field in model.__fields__.items())
+
+
+class Blueprint:
+    """The compiled form of a pydantic model.
+
+    The model introspection happens once: `fields` holds the `Field`
+    wrappers and `unbound` the ready-to-bind WTForms fields, also
+    available by name in `unbound_fields`. A form instance only has to
+    bind them. The blueprint only holds a weak reference to its model,
+    and the `fingerprint` of its fields when it was compiled.
+
+    Blueprints are immutable, as are their fields: they are shared by
+    the forms of all the threads.
+    """
+
+    __slots__ = (
+        '_model', 'fields', 'unbound', 'unbound_fields', 'fingerprint',
+        '__weakref__')
+
+    fields: Mapping[str, Field]
+    unbound: Tuple[Tuple[str, UnboundField], ...]
+    unbound_fields: Mapping[str, UnboundField]
+
+    def __init__(self, model, fields: Dict[str, Field]):
+        init = object.__setattr__
+        init(self, '_model', weakref.ref(model))
+        init(self, 'fields', MappingProxyType(dict(fields)))
+        init(self, 'unbound', tuple(
+            (name, field()) for name, field in fields.items()))
+        init(self, 'unbound_fields', MappingProxyType(dict(self.unbound)))
+        init(self, 'fingerprint', fingerprint(model))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable.')
+
+    @property
+    def model(self) -> Optional[Type[pydantic.BaseModel]]:
+        return self._model()
+
+
+CacheKey = Tuple[
+    Type[pydantic.BaseModel], Optional[FrozenSet[str]],
+    Optional[FrozenSet[str]]
+]
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: Optional[int]
+
+
+class BlueprintCache:
+    """A least recently used cache of blueprints, by model and fields
+    selection, holding at most `maxsize` blueprints (`None` for no
+    limit).
+
+    The models are weakly referenced: the blueprints of a model are
+    dropped when the model is garbage collected, as with dynamically
+    created models.
+
+    Lookups, hits included as they update the recency and the counters,
+    are made under a lock. `build` builds a missing blueprint once,
+    other threads asking for it meanwhile waiting for it.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 1024):
+        self._maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._refs = weakref.WeakKeyDictionary()
+        self._building: Dict[tuple, threading.Lock] = {}
+        self._collected: List[weakref.ref] = []
+        self._lock = threading.RLock()
+        self.hits = self.misses = self.evictions = 0
+
+    def _ref(self, model) -> weakref.ref:
+        ref = self._refs.get(model)
+        if ref is None:
+            with self._lock:
+                ref = self._refs.get(model)
+                if ref is None:
+                    ref = self._refs[model] = weakref.ref(
+                        model, self._collected.append)
+        return ref
+
+    def _purge(self):
+        # Called under the lock: drops the entries of collected models.
+        # The weak reference callbacks only record them, as they can
+        # run at any time, amid changes of the entries.
+        if self._collected:
+            del self._collected[:]
+            for key in tuple(self._entries):
+                if key[0]() is None:
+                    del self._entries[key]
+
+    def _key(self, key: CacheKey):
+        model, include, exclude = key
+        return self._ref(model), include, exclude
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: Optional[int]):
+        with self._lock:
+            self._maxsize = maxsize
+            self._trim()
+
+    def _trim(self):
+        self._purge()
+        if self._maxsize is None:
+            return
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _hit(self, key) -> Optional[Blueprint]:
+        with self._lock:
+            blueprint = self._entries.get(key)
+            if blueprint is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return blueprint
+
+    def get(self, key: CacheKey) -> Optional[Blueprint]:
+        """Returns the cached blueprint, counting a hit or a miss.
+        """
+        with self._lock:
+            blueprint = self._hit(self._key(key))
+            if blueprint is None:
+                self.misses += 1
+            return blueprint
+
+    def build(self, key: CacheKey, build: Callable[[], Blueprint]):
+        """Returns the cached blueprint, or the one `build` returns,
+        then cached. Threads missing the same blueprint at the same time
+        wait for a single build.
+        """
+        key = self._key(key)
+        blueprint = self._hit(key)
+        if blueprint is not None:
+            return blueprint
+
+        with self._lock:
+            self.misses += 1
+            lock = self._building.get(key)
+            if lock is None:
+                lock = self._building[key] = threading.Lock()
+        with lock:
+            blueprint = self._entries.get(key)
+            if blueprint is None:
+                try:
+                    blueprint = build()
+                    with self._lock:
+                        self._store(key, blueprint)
+                finally:
+                    with self._lock:
+                        self._building.pop(key, None)
+        return blueprint
+
+    def _store(self, key, blueprint: Blueprint):
+        self._entries[key] = blueprint
+        self._entries.move_to_end(key)
+        self._trim()
+
+    def __getitem__(self, key: CacheKey) -> Blueprint:
+        return self._entries[self._key(key)]
+
+    def __setitem__(self, key: CacheKey, blueprint: Blueprint):
+        key = self._key(key)
+        with self._lock:
+            self._store(key, blueprint)
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return self._key(key) in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge()
+            return len(self._entries)
+
+    def invalidate(self, model) -> int:
+        """Drops the blueprints of a model, returning how many."""
+        with self._lock:
+            ref = self._refs.pop(model, None)
+            if ref is None:
+                return 0
+            keys = [key for key in tuple(self._entries) if key[0] is ref]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._refs.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            self._purge()
+            return CacheStats(
+                self.hits, self.misses, self.evictions, len(self._entries),
+                self._maxsize)
+
+
+blueprints = BlueprintCache()
+
+
+def cache_key(model, include=None, exclude=None) -> CacheKey:
+    return (
+        model,
+        frozenset(include) if include else None,
+        frozenset(exclude) if exclude else None,
+    )
+
+
+def compile_model(model, include=None, exclude=None) -> Blueprint:
+    key = cache_key(model, include, exclude)
+
+    def build():
+        with trace(tracer_var.get(), 'compile'):
+            return Blueprint(
+                model, model_fields(model, include=include, exclude=exclude))
+
+    return blueprints.build(key, build)
+
+
+def compile_models(
+        models: Iterable[Type[pydantic.BaseModel]], include=None,
+        exclude=None) -> List[Blueprint]:
+    """Compiles the blueprints of the models ahead of their first form,
+    as when a worker process boots.
+
+    The cached blueprint of a model whose fields changed since it was
+    compiled is dropped, with the other blueprints of the model, and
+    compiled again.
+    """
+    compiled = []
+    for model in models:
+        cached = blueprints.get(cache_key(model, include, exclude))
+        if cached is not None and cached.fingerprint != fingerprint(model):
+            blueprints.invalidate(model)
+        compiled.append(compile_model(model, include, exclude))
+    return compiled
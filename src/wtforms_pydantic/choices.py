@@ -0,0 +1,192 @@
+from enum import EnumMeta
+from markupsafe import Markup, escape as html_escape
+from typing import Dict, List, Tuple, Iterator
+from wtforms import widgets
+from wtforms.widgets import html_params
+
+
+# The escaping of xml.sax.saxutils, whose import pulls in urllib.request,
+# http.client and ssl.
+ESCAPED = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+ESCAPED_QUOTES = str.maketrans({
+    '&': '&amp;', '<': '&lt;', '>': '&gt;', "'": '&apos;', '"': '&quot;'})
+
+
+# Marks the field name and id in the checkbox templates: html_params
+# leaves it as is.
+PLACEHOLDER = '\x00'
+
+
+def escape(data: str) -> str:
+    return data.translate(ESCAPED)
+
+
+def _escape(data: str) -> str:
+    return data.translate(ESCAPED_QUOTES)
+
+
+class ChoiceTable:
+    """The precomputed choices of an enum.
+
+    It holds the escaped `(name, label)` choices, also `frozen` in a
+    tuple, the name to member `index` used to coerce, the set of the
+    `members` and the rendered `<option>` tags. It is shared by all the
+    fields built out of the enum, across threads: it is not modified
+    once built, but for the checkbox templates, built on first use. The
+    fields get the `frozen` choices.
+    """
+    choices: List[Tuple[str, str]]
+    frozen: Tuple[Tuple[str, str], ...]
+    index: Dict[str, object]
+    members: frozenset
+
+    def __init__(self, enum: EnumMeta):
+        self.enum = enum
+        self.choices = [
+            (member.name, _escape(member.value)) for member in enum]
+        self.frozen = tuple(self.choices)
+        self.index = dict(enum.__members__)
+        self.members = frozenset(self.index.values())
+        self.options = tuple(
+            (name,
+             widgets.Select.render_option(name, label, False),
+             widgets.Select.render_option(name, label, True))
+            for name, label in self.choices
+        )
+        self._checkboxes = None
+
+    def coerce(self, name):
+        if isinstance(name, self.enum):
+            # already coerced to instance of this enum
+            return name
+        try:
+            return self.index[name]
+        except (KeyError, TypeError):
+            raise ValueError(name)
+
+    def selected(self, data) -> frozenset:
+        """Returns the names of the selected members."""
+        if isinstance(data, self.enum):
+            return frozenset((data.name,))
+        if isinstance(data, (list, tuple, set, frozenset)):
+            return frozenset(
+                member.name for member in data
+                if isinstance(member, self.enum))
+        return frozenset()
+
+    def render_options(self, data) -> str:
+        selected = self.selected(data)
+        return ''.join([
+            on if name in selected else off
+            for name, off, on in self.options
+        ])
+
+    def checkbox_templates(self) -> tuple:
+        """Returns the list items of the checkboxes, rendered once with
+        `{name}` and `{id}` placeholders for the field name and id.
+        """
+        templates = self._checkboxes
+        if templates is not None:
+            return templates
+
+        templates = []
+        for i, (value, label) in enumerate(self.choices):
+            params = {
+                'id': f'{PLACEHOLDER}id-{i}', 'type': 'checkbox',
+                'value': value}
+            label = Markup('<label {}>{}</label>'.format(
+                html_params(**{'for': params['id']}), escape(label)))
+            off = '<input {}>'.format(
+                html_params(name=f'{PLACEHOLDER}name', **params))
+            on = '<input {}>'.format(html_params(
+                name=f'{PLACEHOLDER}name', checked=True, **params))
+            templates.append((value, *(
+                template.replace('{', '{{').replace('}', '}}').replace(
+                    f'{PLACEHOLDER}id', '{id}').replace(
+                    f'{PLACEHOLDER}name', '{name}')
+                for template in (
+                    f'<li>{off} {label}</li>', f'<li>{on} {label}</li>'))))
+        # Concurrent renderings may build the same templates: the last
+        # one is kept, they are equal.
+        templates = self._checkboxes = tuple(templates)
+        return templates
+
+    def checkboxes(self, name: str, id: str) -> Iterator[tuple]:
+        """Yields the rendered list items of the checkboxes of a field,
+        as `(value, unchecked, checked)`.
+        """
+        params = {'name': str(html_escape(name)), 'id': str(html_escape(id))}
+        for value, off, on in self.checkbox_templates():
+            yield value, off.format_map(params), on.format_map(params)
+
+
+def choice_table(enum: EnumMeta) -> ChoiceTable:
+    """Returns the choice table of the enum, built once and kept on the
+    enum itself: dynamically created enums are collected with it.
+    """
+    table = enum.__dict__.get('_choice_table')
+    if table is None:
+        # Concurrent builds are equal, the last one is kept.
+        table = ChoiceTable(enum)
+        enum._choice_table = table
+    return table
+
+
+def enum_choices(enum):
+    table = choice_table(enum)
+    return table.choices, table.coerce
+
+
+def field_table(field):
+    """Returns the choice table the field was built with, if its
+    choices were left untouched.
+    """
+    table = getattr(field.coerce, '__self__', None)
+    if isinstance(table, ChoiceTable):
+        # Enum fields keep the shared choices until they are read.
+        choices = getattr(field, '_choices', None)
+        if choices is None:
+            choices = field.choices
+        if choices is table.frozen or choices == table.choices:
+            return table
+    return None
+
+
+class ChoiceSelect(widgets.Select):
+    """A select widget rendering the options out of the choice table.
+    """
+
+    def __call__(self, field, **kwargs):
+        table = field_table(field)
+        if table is None:
+            return super().__call__(field, **kwargs)
+
+        kwargs.setdefault("id", field.id)
+        if self.multiple:
+            kwargs["multiple"] = True
+        flags = getattr(field, "flags", {})
+        for k in dir(flags):
+            if k in self.validation_attrs and k not in kwargs:
+                kwargs[k] = getattr(flags, k)
+        return Markup("<select {}>{}</select>".format(
+            html_params(name=field.name, **kwargs),
+            table.render_options(field.data)))
+
+
+class ChoiceListWidget(widgets.ListWidget):
+    """A list of checkboxes rendered out of the choice table.
+    """
+
+    def __call__(self, field, **kwargs):
+        table = field_table(field)
+        if table is None or self.prefix_label:
+            return super().__call__(field, **kwargs)
+
+        kwargs.setdefault("id", field.id)
+        selected = table.selected(field.data)
+        items = ''.join([
+            on if name in selected else off
+            for name, off, on in table.checkboxes(field.name, field.id)
+        ])
+        return Markup("<{tag} {params}>{items}</{tag}>".format(
+            tag=self.html_tag, params=html_params(**kwargs), items=items))
@@ -0,0 +1,121 @@
+import collections
+import weakref
+import wtforms.fields
+from typing import Optional, Type, Any, Callable, Dict
+
+
+class ConverterRegistry(collections.UserDict):
+    """Maps python types to the WTForms field classes.
+
+    A type without a registered converter resolves to the converter of
+    its closest registered base class, in MRO order. `NewType` types
+    resolve to their super type. The resolutions are cached per type,
+    the cache being reset when the registry changes. It references the
+    types weakly: pydantic creates a type per constrained field.
+
+    Instead of the `converters`, the registry can be filled with the
+    ones returned by `defaults` on first use, so that their modules are
+    only imported when needed.
+    """
+
+    def __init__(self, converters: Optional[Dict] = None,
+                 defaults: Optional[Callable[[], Dict]] = None):
+        self._cache = weakref.WeakKeyDictionary()
+        self._fixed_cache = {}
+        self._data = dict(converters) if converters is not None else None
+        self.defaults = defaults
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            self._data = dict(self.defaults()) if self.defaults else {}
+        return self._data
+
+    def __setitem__(self, type_, factory):
+        super().__setitem__(type_, factory)
+        self._clear_cache()
+
+    def __delitem__(self, type_):
+        super().__delitem__(type_)
+        self._clear_cache()
+
+    def _clear_cache(self):
+        self._cache.clear()
+        self._fixed_cache.clear()
+
+    def register(self, type_: Any, factory: Type[wtforms.fields.Field]):
+        self[type_] = factory
+
+    def lookup(self, type_: Any) -> Optional[Type[wtforms.fields.Field]]:
+        cache = self._cache
+        try:
+            return cache[type_]
+        except KeyError:
+            pass
+        except TypeError:  # not weakly referenceable
+            cache = self._fixed_cache
+            if type_ in cache:
+                return cache[type_]
+        factory = cache[type_] = self.resolve(type_)
+        return factory
+
+    def resolve(self, type_: Any) -> Optional[Type[wtforms.fields.Field]]:
+        factory = self.data.get(type_)
+        if factory is not None:
+            return factory
+        supertype = getattr(type_, '__supertype__', None)
+        if supertype is not None:
+            return self.resolve(supertype)
+        for base in getattr(type_, '__mro__', ())[1:]:
+            factory = self.data.get(base)
+            if factory is not None:
+                return factory
+        return None
+
+
+def default_simple_converters() -> dict:
+    import datetime
+    import decimal
+    import pydantic.networks
+    from enum import Enum
+    from typing import Literal
+    from wtforms_pydantic._fields import EnumSelectField
+
+    return {
+        str: wtforms.fields.StringField,
+        int: wtforms.fields.IntegerField,
+        float: wtforms.fields.FloatField,
+        bool: wtforms.fields.BooleanField,
+        Enum: EnumSelectField,
+        decimal.Decimal: wtforms.fields.DecimalField,
+        datetime.date: wtforms.fields.DateField,
+        datetime.datetime: wtforms.fields.DateTimeField,
+        datetime.time: wtforms.fields.TimeField,
+        pydantic.SecretStr: wtforms.fields.PasswordField,
+        pydantic.networks.EmailStr: wtforms.fields.EmailField,
+        pydantic.networks.AnyUrl: wtforms.fields.URLField,
+        Literal: EnumSelectField,
+    }
+
+
+def default_multiple_converters() -> dict:
+    from enum import Enum
+    from wtforms_pydantic._fields import EnumMultiCheckboxField
+
+    return {Enum: EnumMultiCheckboxField}
+
+
+simple_converters = ConverterRegistry(defaults=default_simple_converters)
+multiple_converters = ConverterRegistry(
+    defaults=default_multiple_converters)
+
+
+def register_converter(
+        type_: Any, factory: Type[wtforms.fields.Field],
+        multiple: bool = False):
+    """Registers the WTForms field class used for the given type.
+    """
+    if multiple:
+        multiple_converters.register(type_, factory)
+    else:
+        simple_converters.register(type_, factory)
@@ -0,0 +1,123 @@
+import weakref
+from typing import Dict, Set, FrozenSet, Iterable
+
+
+def depends(*fields: str):
+    """Declares the fields a validator reads from its `values`.
+
+    To be applied on the function, under the pydantic decorator::
+
+        @pydantic.validator('identifier')
+        @depends('name')
+        def check(cls, v, values):
+            ...
+    """
+    def declare(func):
+        func.__form_depends__ = frozenset(fields)
+        return func
+    return declare
+
+
+class TrackingValues(dict):
+    """A `values` mapping recording which keys are read.
+
+    Any access to the whole mapping (iteration, keys, items...) counts
+    as reading `everything`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reset()
+
+    def reset(self):
+        self.reads = set()
+        self.everything = False
+
+    def __getitem__(self, key):
+        self.reads.add(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        self.reads.add(key)
+        return super().__contains__(key)
+
+    def get(self, key, default=None):
+        self.reads.add(key)
+        return super().get(key, default)
+
+    def __iter__(self):
+        self.everything = True
+        return super().__iter__()
+
+    def keys(self):
+        self.everything = True
+        return super().keys()
+
+    def values(self):
+        self.everything = True
+        return super().values()
+
+    def items(self):
+        self.everything = True
+        return super().items()
+
+    def copy(self):
+        self.everything = True
+        return dict(super().items())
+
+
+class DependencyGraph:
+    """The fields read by the validators of each field of a model.
+
+    The dependencies come from the `depends` declarations and are
+    completed by the `values` accesses recorded at validation time.
+    Fields whose validators never ran have unknown dependencies.
+    """
+
+    def __init__(self, model):
+        self.reads: Dict[str, Set[str]] = {}
+        self.everything: Set[str] = set()
+        for name, field in model.__fields__.items():
+            for validator in field.class_validators.values():
+                declared = getattr(validator.func, '__form_depends__', None)
+                if declared is not None:
+                    self.reads.setdefault(name, set()).update(declared)
+
+    def record(self, name: str, values: TrackingValues):
+        self.reads.setdefault(name, set()).update(values.reads - {name})
+        if values.everything:
+            self.everything.add(name)
+
+    def affected(
+            self, changed: Iterable[str],
+            names: Iterable[str]) -> FrozenSet[str]:
+        """Returns the fields among `names` to validate again when the
+        `changed` fields changed, along with the changed ones.
+        """
+        affected = set(changed)
+        if not affected:
+            return frozenset()
+        pending = [
+            name for name in names
+            if name not in affected
+            and (name not in self.reads or name in self.everything)
+        ]
+        affected.update(pending)
+        grown = True
+        while grown:
+            grown = False
+            for name, reads in self.reads.items():
+                if name not in affected and not reads.isdisjoint(affected):
+                    affected.add(name)
+                    grown = True
+        return frozenset(affected)
+
+
+graphs = weakref.WeakKeyDictionary()
+
+
+def dependency_graph(model) -> DependencyGraph:
+    graph = graphs.get(model)
+    if graph is None:
+        graph = graphs[model] = DependencyGraph(model)
+    return graph
@@ -1,148 +1,423 @@
-from typing import Optional, Iterable, Any, Literal, TypedDict
+from types import MappingProxyType
+from typing import (
+    Optional, Iterable, Any, TypedDict, Mapping, NamedTuple)
 from enum import Enum, EnumMeta
+from pydantic import BaseModel
 
-import datetime
-import decimal
+import functools
+import threading
+import weakref
 import pydantic
 import wtforms.fields
 import wtforms.validators
-from xml.sax.saxutils import escape
-from wtforms_pydantic._fields import MultiCheckboxField
+from wtforms_pydantic.choices import (  # noqa: F401
+    enum_choices, ChoiceSelect, _escape)
+from wtforms_pydantic.converters import (
+    simple_converters, multiple_converters)
+from wtforms_pydantic._fields import ModelFormField, ModelFieldList
 
 
-def _escape(data):
-    return escape(data, entities={
-        "'": "&apos;",
-        "\"": "&quot;"
-    })
+def first_message(error) -> str:
+    """Returns the message of the first error wrapped in `error`.
 
+    Fields holding several values report a list of errors.
+    """
+    while isinstance(error, (list, tuple)):
+        error = error[0]
+    return str(error.exc)
 
-def enum_choices(enum):
 
-    def coerce(name):
-        if isinstance(name, enum):
-            # already coerced to instance of this enum
-            return name
-        try:
-            return enum[name]
-        except KeyError:
-            raise ValueError(name)
+class FieldValidator:
+    """Validates the data of a WTForms field against its pydantic field.
 
-    choices = [(v.name, _escape(v.value)) for v in enum]
-    return choices, coerce
+    Validators are immutable: they are shared by all the forms bound
+    out of a blueprint.
+    """
 
-
-class FieldValidator:
+    __slots__ = ('field',)
 
     def __init__(self, field):
-        self.field = field
+        object.__setattr__(self, 'field', field)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable.')
 
     def __eq__(self, v):
         if isinstance(v, FieldValidator):
             return self.field is v.field
         return False
 
+    def __hash__(self):
+        return id(self.field)
+
     def __call__(self, form, field):
-        value, error = self.field.validate(
-            field.data, form.data, loc=self.field.name)
+        data = getattr(field, 'model_data', field.data)
+        context = getattr(form, 'context', None)
+        if context is None:
+            values = form.data
+        elif context.submitted is not None:
+            context.submitted[self.field.name] = data
+            return
+        else:
+            values = context.values
+            if context.graph is not None:
+                values.reset()
 
+        if context is not None and context.tracer is not None:
+            with context.tracer.span(f'validator:{self.field.name}'):
+                value, error = self.field.validate(
+                    data, values, loc=self.field.name)
+        else:
+            value, error = self.field.validate(
+                data, values, loc=self.field.name)
+
+        if context is not None and context.graph is not None:
+            context.graph.record(self.field.name, values)
         if error is not None:
-            raise wtforms.validators.ValidationError(str(error.exc))
-
-
-simple_converters = {
-    str: wtforms.fields.StringField,
-    int: wtforms.fields.IntegerField,
-    float: wtforms.fields.FloatField,
-    bool: wtforms.fields.BooleanField,
-    Enum: wtforms.fields.SelectField,
-    decimal.Decimal: wtforms.fields.DecimalField,
-    datetime.date: wtforms.fields.DateField,
-    datetime.datetime: wtforms.fields.DateTimeField,
-    datetime.time: wtforms.fields.TimeField,
-    pydantic.SecretStr: wtforms.fields.PasswordField,
-    pydantic.networks.EmailStr: wtforms.fields.EmailField,
-    Literal: wtforms.fields.SelectField,
-}
+            raise wtforms.validators.ValidationError(first_message(error))
+        if context is not None:
+            context.values[self.field.name] = \
+                context.coerced[self.field.name] = value
 
+    def coerce(self, form, field):
+        """Coerces the data of a field whose validation stopped early, as
+        with the `Optional` validator, so that the model gets the value
+        it would make of the form data. If it is invalid, the model
+        default is kept.
+        """
+        context = getattr(form, 'context', None)
+        if context is not None and context.submitted is not None:
+            context.lenient.add(self.field.name)
+        try:
+            self(form, field)
+        except wtforms.validators.ValidationError:
+            pass
+
+
+# Stateless validators, shared by all the fields.
+REQUIRED = wtforms.validators.DataRequired()
+OPTIONAL = wtforms.validators.Optional()
 
-multiple_converters = {
-    Enum: MultiCheckboxField
+
+# Widgets rendering the choices out of the enum choice tables.
+choice_widgets = {
+    wtforms.fields.SelectField: ChoiceSelect(),
+    wtforms.fields.SelectMultipleField: ChoiceSelect(multiple=True),
 }
 
 
+@functools.lru_cache(maxsize=1024)
+def build_literal_choices(values: tuple) -> EnumMeta:
+    return Enum('Choices', {value: value for value in values})
+
+
+literal_lock = threading.Lock()
+
+
+def literal_choices(values: tuple) -> EnumMeta:
+    """Returns the enum of the literal values, a single one across
+    threads: the fields of the same literal share its choice table.
+    """
+    with literal_lock:
+        return build_literal_choices(values)
+
+
 def field_type_decomposer(type_):
     if pydantic.utils.lenient_issubclass(type_, Enum):
         return Enum, type_
     if pydantic.typing.is_literal_type(type_):
         values = pydantic.typing.all_literal_values(type_)
-        choices = Enum('Choices', {value: value for value in values})
-        return Enum, choices
+        return Enum, literal_choices(tuple(values))
     return type_, None
 
 
+def nested_models(model):
+    for field in model.__fields__.values():
+        if not field.sub_fields and \
+                pydantic.utils.lenient_issubclass(field.type_, BaseModel):
+            yield field.type_
+
+
+# Keyed weakly: dynamically created models are not kept alive.
+recursive_models = weakref.WeakKeyDictionary()
+
+
+def is_recursive(model) -> bool:
+    """Tells if the model contains itself through its scalar nested
+    model fields. Such a model can't be expanded into sub-forms.
+    """
+    try:
+        return recursive_models[model]
+    except KeyError:
+        pass
+    recursive = False
+    seen, stack = set(), list(nested_models(model))
+    while stack:
+        current = stack.pop()
+        if current is model:
+            recursive = True
+            break
+        if current not in seen:
+            seen.add(current)
+            stack.extend(nested_models(current))
+    recursive_models[model] = recursive
+    return recursive
+
+
+class SubForm:
+    """The form class of a nested model.
+
+    The blueprint of the model is resolved when a sub-form is built:
+    recursive models are not expanded beyond the submitted data, and all
+    the sub-forms of a model share its compiled blueprint.
+    """
+
+    def __init__(self, model):
+        self.model = model
+
+    def __eq__(self, other):
+        return isinstance(other, SubForm) and self.model is other.model
+
+    def __hash__(self):
+        return hash(self.model)
+
+    def __call__(self, formdata=None, obj=None, prefix='', **kwargs):
+        from wtforms_pydantic import Form
+        from wtforms_pydantic.blueprint import compile_model
+
+        form = Form(compile_model(self.model).unbound, prefix=prefix)
+        form.model = self.model
+        form.process(formdata, obj, **kwargs)
+        return form
+
+
 class Metadata(TypedDict):
     default: Any
     description: str
     label: str
 
 
-class Field:
+class FieldKind(NamedTuple):
+    """What the type of a field resolves to, shared by the fields of the
+    same type.
+    """
     type_: Any
     canon: Any
     multiple: bool
+    choices: Optional[EnumMeta] = None
+
+
+def resolve_kind(type_, multiple: bool) -> FieldKind:
+    canon, choices = field_type_decomposer(type_)
+    return FieldKind(type_, canon, multiple, choices)
+
+
+@functools.lru_cache(maxsize=4096)
+def interned_kind(type_, args, multiple: bool) -> FieldKind:
+    return resolve_kind(type_, multiple)
+
+
+def field_kind(type_, multiple: bool) -> FieldKind:
+    """Returns the kind of a field type, shared by the fields of that
+    type. Literal types are equal whatever the order of their values:
+    their arguments are part of the key.
+
+    Only the kinds of builtin types and of typing forms are shared.
+    Other classes, such as enums, nested models and the constrained
+    types of pydantic, may be created dynamically, and the kind would
+    keep them alive.
+    """
+    if isinstance(type_, type) and type_.__module__ != 'builtins':
+        return resolve_kind(type_, multiple)
+    try:
+        return interned_kind(
+            type_, getattr(type_, '__args__', None), multiple)
+    except TypeError:  # unhashable type
+        return resolve_kind(type_, multiple)
+
+
+@functools.lru_cache(maxsize=4096)
+def interned_metadata(
+        identity: int, default, description, label) -> Mapping[str, Any]:
+    return MappingProxyType(
+        {'default': default, 'description': description, 'label': label})
+
+
+def field_metadata(default, description, label) -> Mapping[str, Any]:
+    """Returns the read-only metadata of a field, shared by the fields
+    with the same metadata. Defaults are told apart by identity: equal
+    defaults, as `Decimal('1.0')` and `Decimal('1.00')`, are not
+    interchangeable.
+    """
+    try:
+        return interned_metadata(id(default), default, description, label)
+    except TypeError:  # unhashable default
+        return MappingProxyType(
+            {'default': default, 'description': description, 'label': label})
+
+
+class Field:
+    """The WTForms field specification of a pydantic field.
+
+    Fields are immutable: `replace` returns a modified copy. Their type
+    resolution (`kind`) and `metadata` are shared between fields.
+    """
+
+    __slots__ = (
+        'kind', 'metadata', 'required', 'validator', 'factory', 'readonly',
+        '_template')
+
+    kind: FieldKind
     metadata: Metadata
     required: bool
     validator: FieldValidator
-    readonly: bool = False
-    choices: Optional[EnumMeta] = None
-    factory: Optional[wtforms.fields.Field] = None
+    factory: Optional[wtforms.fields.Field]
+    readonly: bool
+    _template: Optional[Mapping[str, Any]]
 
     def __init__(self, field: pydantic.fields.ModelField):
         origin = pydantic.typing.get_origin(field.outer_type_)
-        if origin is not None and \
-                pydantic.utils.lenient_issubclass(origin, Iterable):
-            self.multiple = True
-            self.type_ = field.sub_fields[0].type_
+        multiple = origin is not None and \
+            pydantic.utils.lenient_issubclass(origin, Iterable)
+        if multiple:
+            type_ = field.sub_fields[0].type_
         else:
-            self.multiple = False
-            self.type_ = field.outer_type_
-
-        self.validator = FieldValidator(field)
-        self.canon, self.choices = field_type_decomposer(self.type_)
-        self.required = field.required
-        self.metadata = {
-            'default': field.default or field.field_info.default_factory,
-            'description': field.field_info.description or '',
-            'label': field.field_info.title or field.name,
+            type_ = field.outer_type_
+
+        init = object.__setattr__
+        init(self, 'kind', field_kind(type_, multiple))
+        init(self, 'metadata', field_metadata(
+            field.default or field.field_info.default_factory,
+            field.field_info.description or '',
+            field.field_info.title or field.name,
+        ))
+        init(self, 'required', field.required)
+        init(self, 'validator', FieldValidator(field))
+        init(self, 'factory', None)
+        init(self, 'readonly', False)
+        init(self, '_template', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            f'{type(self).__name__} is immutable, use replace().')
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    @property
+    def type_(self):
+        return self.kind.type_
+
+    @property
+    def canon(self):
+        return self.kind.canon
+
+    @property
+    def multiple(self) -> bool:
+        return self.kind.multiple
+
+    @property
+    def choices(self) -> Optional[EnumMeta]:
+        return self.kind.choices
+
+    def replace(self, **changes) -> 'Field':
+        """Returns a copy of the field with the given attributes changed.
+        The attributes of the `kind` can be changed as well.
+        """
+        kind = {
+            name: changes.pop(name)
+            for name in FieldKind._fields if name in changes
         }
+        if kind:
+            changes['kind'] = self.kind._replace(**kind)
+        if 'metadata' in changes:
+            changes['metadata'] = field_metadata(**changes['metadata'])
+        unknown = set(changes).difference(self.__slots__[:-1])
+        if unknown:
+            raise TypeError(f'Unknown field attributes: {sorted(unknown)}')
 
-    def compute_options(self):
-        options = {}
-        if self.required:
-            options['validators'] = (
-                wtforms.validators.DataRequired(), self.validator)
+        field = object.__new__(type(self))
+        for name in self.__slots__[:-1]:
+            object.__setattr__(
+                field, name, changes.get(name, getattr(self, name)))
+        object.__setattr__(field, '_template', None)
+        return field
+
+    def compute_options(self, **overrides) -> Mapping[str, Any]:
+        """Returns the options of the WTForms field.
+
+        The options are computed once into a read-only template, that is
+        returned as is unless `overrides` are given.
+        """
+        template = self._template
+        if template is None:
+            options = {}
+            if self.required:
+                options['validators'] = (REQUIRED, self.validator)
+            else:
+                options['validators'] = (OPTIONAL, self.validator)
+            if self.choices is not None:
+                options['choices'], options['coerce'] = \
+                    enum_choices(self.choices)
+            template = MappingProxyType({**self.metadata, **options})
+            object.__setattr__(self, '_template', template)
+        if overrides:
+            return {**template, **overrides}
+        return template
+
+    @property
+    def nested(self) -> bool:
+        return self.factory is None and \
+            pydantic.utils.lenient_issubclass(self.canon, BaseModel)
+
+    def lookup_factory(self):
+        if self.factory is not None:
+            return self.factory
+        if not self.multiple:
+            factory = simple_converters.lookup(self.canon)
         else:
-            options['validators'] = (
-                wtforms.validators.Optional(), self.validator)
-        if self.choices is not None:
-            options['choices'], options['coerce'] = \
-                enum_choices(self.choices)
-        return {**self.metadata, **options}
+            factory = multiple_converters.lookup(self.canon)
+        if factory is None:
+            raise TypeError(
+                f'{self.type_} cannot be converted to a WTForms field')
+        return factory
 
     def cast(self):
-        factory = self.factory
-        if factory is None:
-            if not self.multiple:
-                factory = simple_converters.get(self.canon)
-            else:
-                factory = multiple_converters.get(self.canon)
-            if factory is None:
-                raise TypeError(
-                    f'{self.type_} cannot be converted to a WTForms field')
+        if self.nested:
+            return self.cast_nested()
+        factory = self.lookup_factory()
+        widget = choice_widgets.get(factory)
+        if widget is not None and self.choices is not None:
+            return factory, self.compute_options(widget=widget)
+        return factory, self.compute_options()
 
-        options = self.compute_options()
-        return factory, options
+    def cast_nested(self):
+        options = {
+            'label': self.metadata['label'],
+            'description': self.metadata['description'],
+        }
+        form_class = SubForm(self.canon)
+        if self.multiple or not self.required or is_recursive(self.canon):
+            options['default'] = self.metadata['default'] or ()
+            options['validators'] = (
+                (REQUIRED, self.validator) if self.required
+                else (self.validator,))
+            # An optional sub-form is rendered blank, but a recursive
+            # one would expand endlessly.
+            scalar = not self.multiple
+            return ModelFieldList, {
+                'unbound_field': ModelFormField(form_class),
+                'scalar': scalar,
+                'min_entries': int(scalar and not is_recursive(self.canon)),
+                **options
+            }
+        options['default'] = self.metadata['default']
+        return ModelFormField, {
+            'form_class': form_class, 'validator': self.validator, **options
+        }
 
     def __call__(self):
         factory, options = self.cast()
@@ -0,0 +1,164 @@
+from collections.abc import MutableMapping
+from typing import Optional, Iterable
+from wtforms.meta import DefaultMeta
+from wtforms.utils import unset_value
+from wtforms_pydantic import Form
+from wtforms_pydantic.blueprint import Blueprint
+from wtforms_pydantic.instrument import tracer_var, trace
+
+
+class LazyFields(MutableMapping):
+    """The fields of a `LazyForm`, bound on first access.
+
+    The mapping lists all the fields of the form. Only the `bound`
+    fields have been built, getting an unbound one binds it.
+    """
+
+    def __init__(self, form, unbound):
+        self.form = form
+        self.unbound = unbound
+        self.bound = {}
+
+    def __getitem__(self, name):
+        try:
+            return self.bound[name]
+        except KeyError:
+            field = self.bound[name] = self.form.bind(
+                name, self.unbound[name])
+            return field
+
+    def __setitem__(self, name, field):
+        if name not in self.unbound:
+            self.unbound = {**self.unbound, name: None}
+        self.bound[name] = field
+
+    def __delitem__(self, name):
+        self.unbound = {
+            key: value for key, value in self.unbound.items()
+            if key != name
+        }
+        self.bound.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self.unbound
+
+    def __iter__(self):
+        return iter(self.unbound)
+
+    def __len__(self):
+        return len(self.unbound)
+
+    @property
+    def complete(self) -> bool:
+        return len(self.bound) == len(self.unbound)
+
+
+class LazyForm(Form):
+    """A form binding its fields on first access.
+
+    Only the bound fields are processed, validated and listed in the
+    `data` and `errors`: fields bound after the form processing are
+    processed on binding. The fields named in `only` are bound right
+    away. The root validators of the model only run once all the fields
+    are bound.
+
+    A validation of a form with unbound fields is `partial`: it only
+    tells about the bound fields, and the form can't build a model.
+    """
+    _processing: Optional[tuple] = None
+    partial: bool = False
+
+    def __init__(self, fields, prefix='', meta=DefaultMeta(),
+                 only: Optional[Iterable[str]] = None):
+        if prefix and prefix[-1] not in "-_;:/.":
+            prefix += "-"
+
+        self.meta = meta
+        self._prefix = prefix
+        self._translations = meta.get_translations(self)
+        self.form_errors = []
+        if not hasattr(fields, 'items'):
+            fields = dict(fields)
+        self._fields = LazyFields(self, fields)
+
+        if meta.csrf:
+            self._csrf = meta.build_csrf(self)
+            for name, unbound_field in self._csrf.setup_form(self):
+                self._fields[name] = self.bind(name, unbound_field)
+
+        for name in only or ():
+            self._fields[name]
+
+    @classmethod
+    def from_blueprint(cls, blueprint: Blueprint, **kwargs):
+        form = cls(blueprint.unbound_fields, **kwargs)
+        form.model = blueprint.model
+        return form
+
+    def bind(self, name, unbound_field):
+        options = dict(
+            name=unbound_field.name or name, prefix=self._prefix,
+            translations=self._translations)
+        field = self.meta.bind_field(self, unbound_field, options)
+        if self._processing is not None:
+            self.process_field(name, field)
+        return field
+
+    def process(self, formdata=None, obj=None, data=None,
+                extra_filters=None, **kwargs):
+        formdata = self.meta.wrap_formdata(self, formdata)
+        if data is not None:
+            kwargs = dict(data, **kwargs)
+        self._processing = (formdata, obj, kwargs, extra_filters or {})
+        with trace(tracer_var.get(), 'process'):
+            for name, field in self._fields.bound.items():
+                self.process_field(name, field)
+
+    def process_field(self, name, field):
+        formdata, obj, kwargs, filters = self._processing
+        extra_filters = list(filters.get(name, []))
+        inline_filter = getattr(self, "filter_%s" % name, None)
+        if inline_filter is not None:
+            extra_filters.append(inline_filter)
+
+        if obj is not None and hasattr(obj, name):
+            data = getattr(obj, name)
+        else:
+            data = kwargs.get(name, unset_value)
+        field.process(formdata, data, extra_filters=extra_filters)
+
+    def validate_fields(self, extra_validators=None, fields=None) -> bool:
+        if fields is None:
+            fields = tuple(self._fields.bound.items())
+        return super().validate_fields(extra_validators, fields)
+
+    def complete_validation(self, context, success: bool) -> bool:
+        self.partial = not self._fields.complete
+        return super().complete_validation(context, success)
+
+    def to_model(self):
+        if self.partial and self.validated is not None:
+            raise ValueError(
+                'The form was validated before all its fields were bound.')
+        return super().to_model()
+
+    def validate_root(self, data, max_errors=None):
+        if not self._fields.complete:
+            return data
+        return super().validate_root(data, max_errors=max_errors)
+
+    @property
+    def data(self):
+        return {
+            name: field.data for name, field in self._fields.bound.items()
+        }
+
+    @property
+    def errors(self):
+        errors = {
+            name: field.errors
+            for name, field in self._fields.bound.items() if field.errors
+        }
+        if self.form_errors:
+            errors[None] = self.form_errors
+        return errors
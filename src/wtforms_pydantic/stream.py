@@ -0,0 +1,88 @@
+import io
+from typing import Iterable, Optional, Tuple, Any
+
+
+class PayloadTooLarge(ValueError):
+    """The submitted data exceeds the limits of the form.
+    """
+
+
+class StreamData(dict):
+    """Form data gathered out of a stream: the values of each name are
+    kept in a list.
+    """
+
+    def getlist(self, key) -> list:
+        return self[key]
+
+
+def is_known(name: str, names: frozenset) -> bool:
+    while name:
+        if name in names:
+            return True
+        name = name.rpartition('-')[0]
+    return False
+
+
+def value_size(value) -> int:
+    """Returns the size of a value, an uploaded file being measured
+    through its `content_length`, or its stream, without reading it.
+    Values of unknown size count for nothing.
+    """
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    length = getattr(value, 'content_length', None)
+    if length:
+        return length
+    stream = getattr(value, 'stream', value)
+    try:
+        position = stream.tell()
+        end = stream.seek(0, io.SEEK_END)
+        stream.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return 0
+    return end - position
+
+
+def ingest(names: Iterable[str], pairs: Iterable[Tuple[str, Any]],
+           max_field_values: Optional[int] = None,
+           max_value_size: Optional[int] = None,
+           max_payload_size: Optional[int] = None) -> StreamData:
+    """Gathers the `(name, value)` pairs of the given field `names`.
+
+    Pairs of unknown names are dropped, names of nested fields being
+    known through their parent field (`parent-child`); only the kept
+    names are remembered. Bytes are decoded as they arrive, uploaded
+    files are kept as is. `PayloadTooLarge` is raised as soon as a field gets
+    more than `max_field_values` values, a value is bigger than
+    `max_value_size` or the known values exceed `max_payload_size`,
+    without consuming the rest of the stream.
+    """
+    names = frozenset(names)
+    data = StreamData()
+    total = 0
+    for name, value in pairs:
+        if name not in data and not is_known(name, names):
+            continue
+
+        size = value_size(value)
+        if max_value_size is not None and size > max_value_size:
+            raise PayloadTooLarge(
+                f'The value of {name!r} exceeds {max_value_size}.')
+        total += size
+        if max_payload_size is not None and total > max_payload_size:
+            raise PayloadTooLarge(
+                f'The submission exceeds {max_payload_size}.')
+        if isinstance(value, bytes):
+            value = value.decode()
+
+        values = data.get(name)
+        if values is None:
+            data[name] = [value]
+        elif max_field_values is not None and \
+                len(values) >= max_field_values:
+            raise PayloadTooLarge(
+                f'{name!r} exceeds {max_field_values} values.')
+        else:
+            values.append(value)
+    return data
@@ -0,0 +1,115 @@
+import pydantic
+import weakref
+from wtforms_pydantic.instrument import tracer_var
+from typing import (
+    Dict, Tuple, List, NamedTuple, Optional, FrozenSet, Any, Set)
+
+
+class ValidationContext:
+    """State shared by the validators of a single `Form.validate` run.
+
+    `values` is the mapping handed to the pydantic validators. It is
+    built once from the form data and updated with the coerced value of
+    each field that validates. These coerced values are also kept in
+    `coerced`.
+
+    With a dependency `graph`, the values are a `TrackingValues`
+    mapping and the field validators record what they read. When `only`
+    is given, only these fields are validated.
+
+    With `max_errors`, the validation stops once as many fields failed
+    (see `exhausted`).
+
+    In `single_pass` mode, the field validators don't validate: they
+    collect their data in `submitted`, validated afterwards in one model
+    pass. The `lenient` fields are those whose validation stopped early,
+    as with the `Optional` validator: their errors are ignored.
+
+    The `tracer` is the active `Tracer`, if any, when the context is
+    created.
+    """
+
+    def __init__(self, values: dict, graph=None,
+                 only: Optional[FrozenSet[str]] = None,
+                 max_errors: Optional[int] = None, single_pass: bool = False):
+        self.values = values
+        self.graph = graph
+        self.only = only
+        self.max_errors = max_errors
+        self.failures = 0
+        self.tracer = tracer_var.get()
+        self.coerced = {}
+        self.submitted: Optional[Dict[str, Any]] = {} if single_pass else None
+        self.lenient: Set[str] = set()
+
+    def reached(self, name: str) -> bool:
+        """Tells if the field validator of a field that validates ran.
+        """
+        if self.submitted is not None:
+            return name in self.submitted
+        return name in self.coerced
+
+    @property
+    def exhausted(self) -> bool:
+        return self.max_errors is not None \
+            and self.failures >= self.max_errors
+
+
+class FieldResult(NamedTuple):
+    valid: bool
+    errors: Dict[str, List[str]]
+    skipped: Tuple[str, ...] = ()
+
+
+def root_validator_names(model) -> Tuple[str, ...]:
+    return (
+        *(validator.__name__
+          for validator in model.__pre_root_validators__),
+        *(validator.__name__
+          for skip, validator in model.__post_root_validators__),
+    )
+
+
+class FieldsOnly:
+    """Stands for a model in `pydantic.validate_model`, without its root
+    validators: the form runs them afterwards, on its own values.
+    """
+
+    __pre_root_validators__ = ()
+    __post_root_validators__ = ()
+
+    def __init__(self, model):
+        self.__fields__ = model.__fields__
+        self.__config__ = model.__config__
+        self.names = {
+            field.alias: name for name, field in model.__fields__.items()}
+        self.aliased = any(
+            alias != name for alias, name in self.names.items())
+
+
+# Keyed weakly: the stand-ins don't reference their model.
+fields_only_models = weakref.WeakKeyDictionary()
+
+
+def validate_fields_only(model, data: dict):
+    """Validates the data against the fields of the model in one
+    `pydantic.validate_model` pass, without the root validators.
+
+    The data is keyed by field name. Returns the validated values, and
+    the first error message of each field that failed, by field name.
+    """
+    try:
+        stand_in = fields_only_models[model]
+    except KeyError:
+        stand_in = fields_only_models[model] = FieldsOnly(model)
+    if stand_in.aliased:
+        fields = model.__fields__
+        data = {fields[name].alias: value for name, value in data.items()}
+    values, _, error = pydantic.validate_model(stand_in, data, model)
+    errors = {}
+    if error is not None:
+        for item in error.errors():
+            name = stand_in.names.get(item['loc'][0])
+            if name is not None:
+                errors.setdefault(name, item['msg'])
+    return values, errors
@@ -15,6 +15,15 @@ class DummyForm:
     data = None
 
 
+class DummyPostData(dict):
+
+    def getlist(self, key):
+        value = self[key]
+        if not isinstance(value, (list, tuple)):
+            value = [value]
+        return value
+
+
 def factory():
     return 18
 
@@ -59,6 +68,11 @@ def dummy_form():
     return DummyForm()
 
 
+@pytest.fixture
+def post_data():
+    return DummyPostData
+
+
 @pytest.fixture
 def person_model():
     return Person
@@ -0,0 +1,86 @@
+"""Tests for `wtforms_pydantic` package.
+"""
+
+import asyncio
+import pydantic
+from wtforms_pydantic import Form, async_validator
+
+
+CALLS = []
+
+
+class Registration(pydantic.BaseModel):
+    login: str
+    email: str
+    age: int
+
+    @async_validator('email')
+    async def unique_email(cls, v, values):
+        CALLS.append(('email', v))
+        await asyncio.sleep(0.02)
+        if v == 'taken@example.com':
+            raise ValueError('This email is already registered.')
+
+    @async_validator('login', 'email')
+    async def not_banned(cls, v, values):
+        CALLS.append(('banned', v))
+        await asyncio.sleep(0)
+        if v.startswith('spam'):
+            raise ValueError('Banned.')
+
+    @pydantic.root_validator
+    def not_same(cls, values):
+        if values['login'] == values['email']:
+            raise ValueError('The login must not be the email.')
+        return values
+
+
+def validate(post_data, **data):
+    form = Form.from_model(Registration)
+    form.process(post_data(**data))
+    return form, asyncio.run(form.async_validate())
+
+
+def test_async_validate(post_data):
+    CALLS.clear()
+    form, valid = validate(
+        post_data, login='klaus', email='klaus@example.com', age='42')
+    assert valid
+    assert form.to_model().age == 42
+    assert sorted(CALLS) == [
+        ('banned', 'klaus'), ('banned', 'klaus@example.com'),
+        ('email', 'klaus@example.com')]
+
+
+def test_async_errors(post_data):
+    form, valid = validate(
+        post_data, login='spammer', email='taken@example.com', age='42')
+    assert not valid
+    assert form.validated is None
+    assert form.errors == {
+        'login': ['Banned.'],
+        'email': ['This email is already registered.'],
+    }
+
+    form, valid = validate(
+        post_data, login='spammer', email='spam@example.com', age='young')
+    assert not valid
+    assert form.errors == {
+        'login': ['Banned.'],
+        'email': ['Banned.'],
+        'age': ['This field is required.'],
+    }
+
+
+def test_async_after_sync(post_data):
+    CALLS.clear()
+    form, valid = validate(
+        post_data, login='same', email='same', age='42')
+    assert not valid
+    assert form.errors == {None: ['The login must not be the email.']}
+
+    CALLS.clear()
+    form, valid = validate(post_data, login='', email='x@y.z', age='1')
+    assert not valid
+    assert 'login' in form.errors
+    assert ('banned', '') not in CALLS
@@ -0,0 +1,78 @@
+"""Tests for `wtforms_pydantic` package.
+"""
+
+import concurrent.futures
+import multiprocessing
+import types
+from wtforms_pydantic import Form
+from wtforms_pydantic.batch import RecordData, chunked
+
+
+RECORDS = [
+    {'identifier': 'klaus'},
+    {'identifier': 'admin', 'name': 'Admin', 'age': '20'},
+    {'identifier': 'admin', 'name': None, 'age': 30},
+    {'identifier': 'admin', 'name': 'Admin', 'age': 42},
+    {'name': 'Klaus', 'age': '12'},
+]
+
+
+def test_record_data():
+    data = RecordData({'a': 1, 'b': None, 'c': [1, 2], 'd': ''})
+    assert 'b' not in data
+    assert data.getlist('a') == [1]
+    assert data.getlist('c') == [1, 2]
+    assert data.getlist('d') == ['']
+
+
+def test_validate_many(person_model):
+    results = Form.validate_many(person_model, iter(RECORDS))
+    assert isinstance(results, types.GeneratorType)
+    results = list(results)
+    assert [result.index for result in results] == [0, 1, 2, 3, 4]
+    assert [result.valid for result in results] == [
+        True, False, False, True, False]
+
+    assert results[0].values == {
+        'identifier': 'klaus', 'name': 'Klaus', 'age': 18}
+    assert results[1].errors == {}
+    assert results[1].form_errors == ['You must be over 21 to be an admin.']
+    assert results[2].errors == {
+        'identifier': ['The identifier must contain the name in lowercase.']
+    }
+    assert results[3].values == {
+        'identifier': 'admin', 'name': 'Admin', 'age': 42}
+    assert results[4].errors == {
+        'identifier': ['This field is required.'],
+        'age': ['must be over 18 years old.'],
+    }
+
+
+def test_validate_many_matches_forms(person_model):
+    for result in Form.validate_many(person_model, RECORDS):
+        form = Form.from_model(person_model)
+        form.process(RecordData(RECORDS[result.index]))
+        assert form.validate() is result.valid
+        assert form.form_errors == result.form_errors
+        assert {
+            name: errors for name, errors in form.errors.items() if name
+        } == result.errors
+
+
+def test_validate_many_parallel(person_model):
+    context = multiprocessing.get_context('fork')
+    records = RECORDS * 7
+    expected = list(Form.validate_many(person_model, records))
+    with concurrent.futures.ProcessPoolExecutor(
+            2, mp_context=context) as executor:
+        results = list(Form.validate_many(
+            person_model, iter(records), parallel=True, chunksize=3,
+            workers=2, executor=executor))
+    assert results == expected
+    assert [result.index for result in results] == list(range(35))
+
+
+def test_chunked():
+    assert list(chunked(range(7), 3)) == [
+        (0, [0, 1, 2]), (3, [3, 4, 5]), (6, [6])]
+    assert list(chunked([], 3)) == []
@@ -0,0 +1,144 @@
+"""Tests for `wtforms_pydantic` package.
+"""
+
+import gc
+import enum
+import weakref
+import pydantic
+from wtforms_pydantic import Form, compile_model, compile_models, blueprints
+from wtforms_pydantic.converters import simple_converters
+from wtforms_pydantic.blueprint import (
+    Blueprint, BlueprintCache, CacheStats, model_fields)
+
+
+def test_blueprint_is_cached(person_model):
+    blueprint = compile_model(person_model)
+    assert compile_model(person_model) is blueprint
+    assert blueprint.model is person_model
+    assert list(blueprint.fields) == ['identifier', 'name', 'age']
+
+    partial = compile_model(person_model, include={'name', 'age'})
+    assert partial is not blueprint
+    assert compile_model(person_model, include=['age', 'name']) is partial
+    assert list(partial.fields) == ['name', 'age']
+
+
+def test_forms_share_unbound_fields(person_model):
+    form1 = Form.from_model(person_model)
+    form2 = Form.from_model(person_model, exclude={'age'})
+    form3 = Form.from_model(person_model)
+    assert form1.model is form3.model is person_model
+    assert form1['name'] is not form3['name']
+    assert 'age' not in form2
+
+    form1.process(data={'identifier': 'klaus'})
+    form3.process(data={'identifier': 'admin'})
+    assert form1.validate()
+    assert not form3.validate()
+    assert form1.errors == {}
+
+
+def make_model(name):
+    return pydantic.create_model(name, title=(str, ...), count=(int, 0))
+
+
+def test_cache_lru():
+    cache = BlueprintCache(maxsize=2)
+    models = [make_model(f'Model{i}') for i in range(3)]
+    blueprint = Blueprint(models[0], model_fields(models[0]))
+    cache[(models[0], None, None)] = blueprint
+    cache[(models[1], None, None)] = Blueprint(
+        models[1], model_fields(models[1]))
+    assert cache.get((models[0], None, None)) is blueprint
+    assert cache.get((models[2], None, None)) is None
+
+    cache[(models[2], None, None)] = Blueprint(
+        models[2], model_fields(models[2]))
+    assert (models[0], None, None) in cache
+    assert (models[1], None, None) not in cache
+    assert cache.stats() == CacheStats(
+        hits=1, misses=1, evictions=1, size=2, maxsize=2)
+
+    cache.maxsize = 1
+    assert len(cache) == 1
+    assert cache.stats().evictions == 2
+
+
+def test_cache_invalidation(person_model):
+    blueprints.invalidate(person_model)
+    blueprint = compile_model(person_model)
+    compile_model(person_model, exclude={'age'})
+    assert blueprints.invalidate(person_model) == 2
+    assert (person_model, None, None) not in blueprints
+    assert compile_model(person_model) is not blueprint
+    assert blueprints.invalidate(make_model('Unknown')) == 0
+
+    blueprints.clear()
+    assert (person_model, None, None) not in blueprints
+
+
+def test_cache_drops_collected_models():
+    model = make_model('Tenant')
+    form = Form.from_model(model)
+    size = len(blueprints)
+    blueprint = weakref.ref(compile_model(model))
+    del model, form
+    gc.collect()
+    assert len(blueprints) == size - 1
+    assert blueprint() is None
+
+
+def test_cache_drops_collected_nested_models():
+    size = blueprints.stats().size
+    color = enum.Enum('Color', {'red': 'Red', 'blue': 'Blue'})
+    address = pydantic.create_model('Address', city=(str, ...))
+    model = pydantic.create_model(
+        'Customer', color=(color, ...), tags=(list[color], []),
+        address=(address, ...), previous=(list[address], []))
+    form = Form.from_model(model)
+    form.process(data={'color': color.red})
+    form['color']()
+    assert blueprints.stats().size == size + 2
+
+    refs = [weakref.ref(obj) for obj in (color, address, model)]
+    del color, address, model, form
+    gc.collect()
+    # The entry of the model is dropped on the next cache access, then
+    # its fields are collected with the nested model and the enum.
+    assert blueprints.stats().size == size + 1
+    gc.collect()
+    assert [ref() for ref in refs] == [None, None, None]
+    assert blueprints.stats().size == size
+
+
+def test_constrained_types_are_collected():
+    size = len(simple_converters._cache)
+    models = [
+        pydantic.create_model(
+            f'Constrained{i}', name=(pydantic.constr(max_length=i + 1), ...),
+            count=(pydantic.conint(gt=i), 0))
+        for i in range(200)]
+    for model in models:
+        Form.from_model(model)
+    assert len(simple_converters._cache) == size + 400
+
+    del models, model
+    gc.collect()
+    len(blueprints)
+    gc.collect()
+    assert len(simple_converters._cache) == size
+
+
+def test_compile_models(person_model):
+    model = make_model('Warm')
+    warm = compile_models([person_model, model])
+    assert warm == [compile_model(person_model), compile_model(model)]
+    assert compile_models([model]) == warm[1:]
+
+    partial = compile_model(model, exclude={'count'})
+    del model.__fields__['count']
+    blueprint, = compile_models([model])
+    assert blueprint is not warm[1]
+    assert list(blueprint.fields) == ['title']
+    assert (model, None, frozenset({'count'})) not in blueprints
+    assert partial.fingerprint != blueprint.fingerprint
@@ -2,6 +2,7 @@
 """
 
 import enum
+import gc
 import datetime
 import pytest
 import typing
@@ -9,7 +10,10 @@ import pydantic
 import wtforms.fields
 import wtforms.validators
 from wtforms_pydantic.field import Field
-from wtforms_pydantic._fields import MultiCheckboxField
+from wtforms_pydantic import register_converter
+from wtforms_pydantic._fields import (
+    EnumSelectField, EnumMultiCheckboxField)
+from wtforms_pydantic.converters import ConverterRegistry, simple_converters
 
 
 def test_int_casting():
@@ -113,7 +117,7 @@ def test_enum_casting():
 
     field = Field(Model.__fields__['field'])
     factory, options = field.cast()
-    assert factory == wtforms.fields.SelectField
+    assert factory == EnumSelectField
     assert options['choices'] == [('foo', 'Foo'), ('bar', 'Bar')]
     assert options['coerce']('foo')
     with pytest.raises(ValueError):
@@ -134,7 +138,7 @@ def test_multiple_enum_casting():
     for fname in ('field1', 'field2', 'field3'):
         field = Field(Model.__fields__[fname])
         factory, options = field.cast()
-        assert factory == MultiCheckboxField
+        assert factory == EnumMultiCheckboxField
         assert options['choices'] == [('foo', 'Foo'), ('bar', 'Bar')]
         assert options['coerce']('foo')
         with pytest.raises(ValueError):
@@ -149,7 +153,7 @@ def test_literal_casting():
 
     field = Field(Model.__fields__['unique'])
     factory, options = field.cast()
-    assert factory == wtforms.fields.SelectField
+    assert factory == EnumSelectField
     assert options['choices'] == [('singleton', 'singleton')]
     assert options['coerce']('singleton')
     with pytest.raises(ValueError):
@@ -157,7 +161,7 @@ def test_literal_casting():
 
     field = Field(Model.__fields__['multiple'])
     factory, options = field.cast()
-    assert factory == wtforms.fields.SelectField
+    assert factory == EnumSelectField
     assert options['choices'] == [
         ('complex', 'complex'), ('complicated', 'complicated')]
     assert options['coerce']('complex')
@@ -172,9 +176,97 @@ def test_multiple_literal_casting():
 
     field = Field(Model.__fields__['multiple'])
     factory, options = field.cast()
-    assert factory == MultiCheckboxField
+    assert factory == EnumMultiCheckboxField
     assert options['choices'] == [
         ('complex', 'complex'), ('complicated', 'complicated')]
     assert options['coerce']('complex')
     with pytest.raises(ValueError):
         assert options['coerce']('other value')
+
+
+def test_literal_choices_are_shared():
+
+    class Model(pydantic.BaseModel):
+        first: typing.Literal['complex', 'complicated']
+        second: typing.List[typing.Literal['complex', 'complicated']]
+        other: typing.Literal['complicated', 'complex']
+
+    first = Field(Model.__fields__['first'])
+    second = Field(Model.__fields__['second'])
+    other = Field(Model.__fields__['other'])
+    assert first.choices is second.choices
+    assert other.choices is not first.choices
+    assert Field(Model.__fields__['first']).choices is first.choices
+
+    _, options1 = first.cast()
+    _, options2 = second.cast()
+    assert options1['choices'] is options2['choices']
+    assert options1['coerce'] == options2['coerce']
+
+
+def test_subclass_casting():
+
+    class Name(str):
+        pass
+
+    UserId = typing.NewType('UserId', int)
+
+    class Model(pydantic.BaseModel):
+        name: Name
+        short: pydantic.constr(max_length=10)
+        count: pydantic.conint(gt=0)
+        positive: pydantic.PositiveInt
+        user: UserId
+        url: pydantic.HttpUrl
+
+    expected = {
+        'name': wtforms.fields.StringField,
+        'short': wtforms.fields.StringField,
+        'count': wtforms.fields.IntegerField,
+        'positive': wtforms.fields.IntegerField,
+        'user': wtforms.fields.IntegerField,
+        'url': wtforms.fields.URLField,
+    }
+    for name, expected_factory in expected.items():
+        factory, options = Field(Model.__fields__[name]).cast()
+        assert factory == expected_factory
+
+
+def test_register_converter():
+
+    class Color(str):
+        pass
+
+    class Model(pydantic.BaseModel):
+        color: Color
+
+    registry = ConverterRegistry({str: wtforms.fields.StringField})
+    assert registry.lookup(Color) is wtforms.fields.StringField
+    assert registry.lookup(int) is None
+
+    registry.register(Color, wtforms.fields.SearchField)
+    assert registry.lookup(Color) is wtforms.fields.SearchField
+
+    register_converter(Color, wtforms.fields.SearchField)
+    try:
+        factory, options = Field(Model.__fields__['color']).cast()
+        assert factory == wtforms.fields.SearchField
+    finally:
+        del simple_converters[Color]
+    factory, options = Field(Model.__fields__['color']).cast()
+    assert factory == wtforms.fields.StringField
+
+
+def test_converter_cache_is_weak():
+    registry = ConverterRegistry({str: wtforms.fields.StringField})
+    types = [pydantic.constr(max_length=i + 1) for i in range(20)]
+    for type_ in types:
+        assert registry.lookup(type_) is wtforms.fields.StringField
+    assert registry.lookup('Forward') is None  # not weakly referenceable
+    assert len(registry._cache) == 20
+    del types, type_
+    gc.collect()
+    assert len(registry._cache) == 0
+    assert registry.lookup('Forward') is None
+    registry.register(int, wtforms.fields.IntegerField)
+    assert not registry._fixed_cache
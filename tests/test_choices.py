@@ -0,0 +1,112 @@
+"""Tests for `wtforms_pydantic` package.
+"""
+
+import enum
+import typing
+import pytest
+import pydantic
+import wtforms.widgets
+from wtforms_pydantic import Form
+from wtforms_pydantic.choices import (
+    ChoiceTable, ChoiceSelect, ChoiceListWidget, choice_table)
+
+
+class Country(enum.Enum):
+    de = 'Germany'
+    fr = 'France'
+    it = "Italy's"
+
+
+class Model(pydantic.BaseModel):
+    country: Country
+    countries: typing.List[Country] = []
+
+
+def test_choice_table():
+    table = choice_table(Country)
+    assert choice_table(Country) is table
+    assert table.choices == [
+        ('de', 'Germany'), ('fr', 'France'), ('it', 'Italy&apos;s')]
+    assert table.coerce('fr') is Country.fr
+    assert table.coerce(Country.it) is Country.it
+    with pytest.raises(ValueError):
+        table.coerce('es')
+    with pytest.raises(ValueError):
+        table.coerce(['de'])
+    assert table.selected([Country.de, 'fr']) == {'de'}
+
+
+@pytest.mark.parametrize('data', [
+    {},
+    {'country': 'fr', 'countries': ['de', 'it']},
+])
+def test_rendering_matches_wtforms(data, post_data):
+    form = Form.from_model(Model, prefix='f')
+    form.process(post_data({f'f-{key}': value for key, value in data.items()}))
+    assert isinstance(form['country'].widget, ChoiceSelect)
+    assert isinstance(form['countries'].widget, ChoiceListWidget)
+
+    select = form['country']()
+    checkboxes = form['countries']()
+    assert select == wtforms.widgets.Select()(form['country'])
+    assert checkboxes == wtforms.widgets.ListWidget(
+        prefix_label=False)(form['countries'])
+    assert form['country'](class_='x') == wtforms.widgets.Select()(
+        form['country'], class_='x')
+
+
+def test_checkboxes_of_many_prefixes(post_data):
+    table = choice_table(Country)
+    templates = table.checkbox_templates()
+    for prefix in ('items-0', 'items-1', 'a"{b}&<c>'):
+        form = Form.from_model(Model, prefix=prefix)
+        form.process(post_data({f'{prefix}-countries': 'fr'}))
+        assert form['countries']() == wtforms.widgets.ListWidget(
+            prefix_label=False)(form['countries'])
+    assert table.checkbox_templates() is templates
+
+
+def test_rendering_with_changed_choices(post_data):
+    form = Form.from_model(Model)
+    form.process(post_data({'country': 'de'}))
+    form['country'].choices = [('de', 'Deutschland')]
+    assert form['country']() == (
+        '<select id="country" name="country" required>'
+        '<option selected value="de">Deutschland</option></select>')
+    assert isinstance(form['country'].coerce.__self__, ChoiceTable)
+
+
+def test_changing_shared_choices(post_data):
+    table = choice_table(Country)
+    form = Form.from_model(Model)
+    form.process(post_data({'country': 'it'}))
+    assert 'Italy' in form['country']()
+    assert form['country']._choices is table.frozen
+
+    form['country'].choices.pop()
+    form['country'].choices.append(('it', 'Italia'))
+    assert len(table.choices) == 3
+    assert table.frozen == tuple(table.choices)
+    assert '<option selected value="it">Italia</option>' in form['country']()
+    assert Form.from_model(Model)['country']._choices is table.frozen
+
+
+def test_enum_fields_membership(post_data):
+    form1 = Form.from_model(Model)
+    form2 = Form.from_model(Model)
+    form1.process(post_data({'country': 'it', 'countries': ['de', 'fr']}))
+    form2.process(post_data({'country': 'it'}))
+    table = choice_table(Country)
+    assert form1['country']._choices is table.frozen
+    assert form2['countries']._choices is table.frozen
+
+    assert form1.validate(), form1.errors
+    assert form1.to_model() == Model(
+        country=Country.it, countries=[Country.de, Country.fr])
+
+    form1['countries'].data.append('es')
+    form1['country'].data = 'es'
+    assert not form1.validate()
+    assert form1.errors['country'][0] == 'Not a valid choice.'
+    assert form1.errors['countries'][0] == (
+        "'es' is not a valid choice for this field.")
@@ -0,0 +1,147 @@
+"""Tests for `wtforms_pydantic` package.
+"""
+
+import pydantic
+from wtforms_pydantic import Form, depends
+from wtforms_pydantic.dependencies import (
+    TrackingValues, DependencyGraph, dependency_graph)
+
+
+CALLS = []
+
+
+class Account(pydantic.BaseModel):
+    login: str
+    password: str
+    confirmation: str
+    nickname: str
+
+    @pydantic.validator('confirmation')
+    def same_password(cls, v, values):
+        CALLS.append(v)
+        if v != values.get('password'):
+            raise ValueError('Passwords do not match.')
+        return v
+
+    @pydantic.validator('nickname')
+    @depends('login')
+    def not_login(cls, v, values):
+        return v
+
+
+def test_tracking_values():
+    values = TrackingValues(a=1, b=2)
+    assert values['a'] == 1
+    assert 'c' not in values
+    assert values.get('d') is None
+    assert values.reads == {'a', 'c', 'd'}
+    assert not values.everything
+    list(values.items())
+    assert values.everything
+    values.reset()
+    assert values.reads == set() and not values.everything
+
+
+def test_graph_affected():
+    graph = DependencyGraph(Account)
+    assert graph.reads == {'nickname': {'login'}}
+    names = list(Account.__fields__)
+    assert graph.affected([], names) == frozenset()
+    assert graph.affected(['login'], names) == {
+        'login', 'password', 'confirmation', 'nickname'}
+
+    values = TrackingValues(password='x')
+    values.get('password')
+    graph.record('confirmation', values)
+    graph.record('login', TrackingValues())
+    graph.record('password', TrackingValues())
+    assert graph.affected(['login'], names) == {'login', 'nickname'}
+    assert graph.affected(['password'], names) == {
+        'password', 'confirmation'}
+
+
+def test_revalidate(post_data):
+    form = Form.from_model(Account)
+    form.process(post_data(
+        login='klaus', password='secret', confirmation='secrte',
+        nickname='kk'))
+    assert not form.revalidate()
+    assert form.errors == {'confirmation': ['Passwords do not match.']}
+    assert dependency_graph(Account).reads['confirmation'] == {'password'}
+
+    CALLS.clear()
+    form.process(post_data(
+        login='klausi', password='secret', confirmation='secrte',
+        nickname='kk'))
+    assert not form.revalidate()
+    assert CALLS == []
+    assert form.errors == {'confirmation': ['Passwords do not match.']}
+
+    form.process(post_data(
+        login='klausi', password='secrte', confirmation='secrte',
+        nickname='kk'))
+    assert form.revalidate()
+    assert CALLS == ['secrte']
+    assert form.to_model() == Account(
+        login='klausi', password='secrte', confirmation='secrte',
+        nickname='kk')
+
+    CALLS.clear()
+    assert form.revalidate()
+    assert CALLS == []
+
+
+class Amount(pydantic.BaseModel):
+    a: int
+
+    @pydantic.validator('a')
+    def positive(cls, v):
+        if v < 0:
+            raise ValueError('neg')
+        return v
+
+
+def test_validate_resets_revalidate(post_data):
+    form = Form.from_model(Amount)
+    form.process(post_data(a='1'))
+    assert form.revalidate()
+    form.process(post_data(a='-1'))
+    assert not form.validate()
+    assert form.tracked is None
+    form.process(post_data(a='1'))
+    assert form.revalidate()
+    assert form.errors == {}
+    assert form.to_model() == Amount(a=1)
+
+    form.process(post_data(a='-1'))
+    assert not form.validate_field('a').valid
+    form.process(post_data(a='1'))
+    assert form.revalidate()
+    assert form.errors == {}
+
+
+class Pair(pydantic.BaseModel):
+    a: int
+    b: int
+
+    @pydantic.validator('b')
+    def positive(cls, v):
+        if v < 0:
+            raise ValueError('neg')
+        return v
+
+
+def test_revalidate_after_exhausted_budget(post_data):
+    form = Form.from_model(Pair)
+    form.fail_fast = True
+    form.process(post_data(a='x', b='-1'))
+    assert not form.revalidate()
+    assert list(form.errors) == ['a']
+    assert form.tracked is None
+
+    form.process(post_data(a='1', b='-1'))
+    assert not form.revalidate()
+    assert form.errors == {'b': ['neg']}
+    form.process(post_data(a='1', b='2'))
+    assert form.revalidate()
+    assert form.to_model() == Pair(a=1, b=2)
@@ -1,7 +1,13 @@
 """Tests for `wtforms_pydantic` package.
 """
 
-from wtforms_pydantic import Form
+import typing
+import pytest
+import pydantic
+from wtforms_pydantic import Form, Tracer
+
+
+CALLS = []
 
 
 def test_fields(person_model):
@@ -18,3 +24,231 @@ def test_fields(person_model):
     form.validate()
     assert form.errors == {None: ['You must be over 21 to be an admin.']}
     assert form.form_errors == ['You must be over 21 to be an admin.']
+
+
+def test_data_built_once_per_validation(person_model):
+
+    class CountingForm(Form):
+        data_calls = 0
+
+        @property
+        def data(self):
+            self.data_calls += 1
+            return super().data
+
+    form = CountingForm.from_model(person_model)
+    form.process(data={'age': 18, 'identifier': 'klaus', 'name': 'Klaus'})
+    assert form.validate()
+    assert form.data_calls == 1
+
+    form.process(data={'age': 18, 'identifier': 'admin', 'name': 'Klaus'})
+    assert not form.validate()
+    assert form.errors == {
+        'identifier': ['The identifier must contain the name in lowercase.']
+    }
+
+
+def test_to_model(person_model, post_data):
+    form = Form.from_model(person_model)
+    with pytest.raises(ValueError):
+        form.to_model()
+
+    form.process(post_data(age='42', identifier='admin', name='Admin'))
+    assert form.validate()
+    person = form.to_model()
+    assert isinstance(person, person_model)
+    assert person == person_model(age=42, identifier='admin', name='Admin')
+    assert person.__fields_set__ == {'age', 'identifier', 'name'}
+
+    form.process(post_data(age='12', identifier='admin', name='Admin'))
+    assert not form.validate()
+    with pytest.raises(ValueError):
+        form.to_model()
+
+
+def test_validate_field(person_model, post_data):
+    form = Form.from_model(person_model)
+    form.process(post_data(identifier='admin', name='Klaus', age='12'))
+
+    result = form.validate_field('age')
+    assert result == (
+        False, {'age': ['must be over 18 years old.']},
+        ('check_identifier_for_admin',))
+    assert form['identifier'].errors == ()
+
+    result = form.validate_field('identifier')
+    assert result.valid
+    assert result.errors == {}
+
+    result = form.validate_field('identifier', dependencies=['name'])
+    assert not result.valid
+    assert result.errors == {
+        'identifier': ['The identifier must contain the name in lowercase.']
+    }
+    assert form.form_errors == []
+
+
+class Signup(pydantic.BaseModel):
+    login: str
+    age: int
+    size: int
+
+    @pydantic.root_validator(pre=True)
+    def not_admin(cls, values):
+        if values.get('login') == 'admin':
+            raise ValueError('Reserved login.')
+        return values
+
+    @pydantic.root_validator(skip_on_failure=True)
+    def adult(cls, values):
+        CALLS.append('adult')
+        if values['age'] < 18:
+            raise ValueError('Too young.')
+        return values
+
+    @pydantic.root_validator
+    def small(cls, values):
+        if values['size'] > 2:
+            raise ValueError('Too big.')
+        return values
+
+
+def test_error_budget(post_data):
+    junk = post_data(login='', age='x', size='y')
+    form = Form.from_model(Signup)
+    form.process(junk)
+    assert not form.validate()
+    assert list(form.errors) == ['login', 'age', 'size']
+
+    form.fail_fast = True
+    assert not form.validate()
+    assert list(form.errors) == ['login']
+
+    form.fail_fast, form.max_errors = False, 2
+    assert not form.validate()
+    assert list(form.errors) == ['login', 'age']
+
+    form.process(post_data(login='klaus', age='1', size='3'))
+    assert not form.validate()
+    assert form.errors == {None: ['Too young.', 'Too big.']}
+
+    form.max_errors = 1
+    assert not form.validate()
+    assert form.errors == {None: ['Too young.']}
+
+
+def test_root_skip_on_failure(post_data):
+    CALLS.clear()
+    form = Form.from_model(Signup)
+    form.process(post_data(login='admin', age='1', size='3'))
+    assert not form.validate()
+    assert form.errors == {None: ['Reserved login.', 'Too big.']}
+    assert CALLS == []
+
+
+def test_to_model_of_empty_optional_fields(post_data):
+
+    class Options(pydantic.BaseModel):
+        name: str
+        flag: bool = True
+        note: str = 'none'
+        count: typing.Optional[int] = 5
+        size: int = 3
+
+    form = Form.from_model(Options)
+    form.process(post_data(name='Klaus', note='', count=''))
+    assert form.validate()
+    assert form.to_model() == Options(**form.data)
+    assert form.to_model().flag is False
+    assert form.to_model().note == ''
+    assert form.to_model().count is None
+
+    result, = Form.validate_many(Options, [{'name': 'Klaus', 'size': ''}])
+    assert result.values == {
+        'name': 'Klaus', 'flag': False, 'note': 'none', 'count': 5}
+
+    class Wrapper(pydantic.BaseModel):
+        options: Options
+
+    form = Form.from_model(Wrapper)
+    form.process(post_data(**{'options-name': 'Klaus'}))
+    assert form.validate()
+    assert form.to_model().options.flag is False
+
+
+def test_error_budget_with_sub_forms(post_data):
+
+    class Street(pydantic.BaseModel):
+        name: str
+
+    class Address(pydantic.BaseModel):
+        number: int
+        street: Street
+
+    form = Form.from_model(Address)
+    form.process(post_data(**{'number': 'x', 'street-name': ''}))
+    assert not form.validate()
+    assert list(form.errors) == ['number', 'street']
+
+    form.fail_fast = True
+    assert not form.validate()
+    assert list(form.errors) == ['number']
+    assert form['street'].errors == {}
+
+
+class Delivery(pydantic.BaseModel):
+    street: str
+
+
+class Shipment(pydantic.BaseModel):
+    reference: str = pydantic.Field(alias='ref')
+    weight: int
+    limit: int = 10
+    express: bool = True
+    note: typing.Optional[int] = None
+    delivery: Delivery
+
+    @pydantic.validator('limit')
+    def under_weight(cls, v, values):
+        weight = values.get('weight')
+        if weight is not None and v < weight:
+            raise ValueError('Over the limit.')
+        return v
+
+    @pydantic.root_validator
+    def no_express_note(cls, values):
+        if values['express'] and values['note']:
+            raise ValueError('No note for express shipments.')
+        return values
+
+
+def test_single_pass_validation(post_data):
+    submissions = [
+        {},
+        {'reference': 'A', 'weight': 'x', 'limit': '2', 'delivery-street': ''},
+        {'reference': 'A', 'weight': '5', 'limit': '2',
+         'delivery-street': 'Main'},
+        {'reference': 'A', 'weight': '5', 'note': '3', 'express': 'y',
+         'delivery-street': 'Main'},
+        {'reference': 'A', 'weight': '5', 'note': '',
+         'delivery-street': 'Main'},
+    ]
+    for data in submissions:
+        for fail_fast in (False, True):
+            form = Form.from_model(Shipment)
+            form.fail_fast = fail_fast
+            form.process(post_data(data))
+            valid = form.validate()
+            expected = valid, form.errors, form.validated
+
+            form = Form.from_model(Shipment)
+            form.fail_fast = fail_fast
+            form.single_pass = True
+            form.process(post_data(data))
+            with Tracer() as tracer:
+                assert (form.validate(), form.errors, form.validated) == \
+                    expected
+            assert 'validator:weight' not in tracer.records
+            assert tracer.records['validate.model'][0] == 1
+            if valid:
+                assert form.to_model().express is False
@@ -0,0 +1,24 @@
+"""Tests for `wtforms_pydantic` package.
+"""
+
+import subprocess
+import sys
+
+
+def test_optional_parts_are_lazy():
+    code = (
+        'import sys, wtforms_pydantic\n'
+        'print(sorted(name for name in ('
+        '"asyncio", "concurrent.futures", "wtforms_pydantic.batch", '
+        '"wtforms_pydantic.stream", '
+        '"wtforms_pydantic.lazy", "urllib.request") if name in sys.modules))\n'
+        'from wtforms_pydantic.converters import simple_converters\n'
+        'print(simple_converters._data is None)\n'
+        'from wtforms_pydantic import LazyForm, BatchResult\n'
+        'print(LazyForm.__module__, BatchResult.__module__)\n'
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        check=True, capture_output=True, text=True).stdout.splitlines()
+    assert output == [
+        '[]', 'True', 'wtforms_pydantic.lazy wtforms_pydantic.batch']
@@ -0,0 +1,51 @@
+"""Tests for `wtforms_pydantic` package.
+"""
+
+import pydantic
+from wtforms_pydantic import Form, Tracer
+from wtforms_pydantic.blueprint import blueprints
+from wtforms_pydantic.instrument import tracer_var
+
+
+class Login(pydantic.BaseModel):
+    user: str
+    password: str
+
+    @pydantic.root_validator
+    def not_same(cls, values):
+        if values.get('user') == values.get('password'):
+            raise ValueError('Use another password.')
+        return values
+
+
+def test_tracer(post_data):
+    blueprints.clear()
+    with Tracer() as tracer:
+        assert tracer_var.get() is tracer
+        form = Form.from_model(Login)
+        form.process(post_data(user='admin', password='secret'))
+        assert form.validate()
+    assert tracer_var.get() is None
+
+    records = tracer.as_dict()
+    assert set(records) == {
+        'compile', 'bind', 'process', 'validate', 'validate.fields',
+        'validate.root', 'field:user', 'field:password',
+        'validator:user', 'validator:password', 'root:not_same',
+    }
+    assert records['validate']['count'] == 1
+    assert records['validate']['total_ms'] >= \
+        records['validate.fields']['total_ms']
+
+    lines = tracer.to_statsd(prefix='forms')
+    assert 'forms.field.user.count:1|c' in lines
+    assert any(line.startswith('forms.validate.time:') for line in lines)
+
+
+def test_no_tracer(post_data):
+    tracer = Tracer()
+    form = Form.from_model(Login)
+    form.process(post_data(user='admin', password='secret'))
+    assert form.validate()
+    assert tracer.records == {}
+    assert form.context is None
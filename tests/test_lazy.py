@@ -0,0 +1,68 @@
+"""Tests for `wtforms_pydantic` package.
+"""
+
+import pytest
+import pydantic
+from wtforms_pydantic import LazyForm
+
+
+Wide = pydantic.create_model(
+    'Wide', **{f'field{i}': (int, ...) for i in range(300)})
+
+
+def test_lazy_binding(post_data):
+    form = LazyForm.from_model(Wide, only={'field1', 'field2'})
+    assert len(form._fields.bound) == 2
+    assert len(form._fields) == 300
+    assert 'field299' in form
+
+    form.process(post_data({'field1': '1', 'field2': 'two', 'field3': '3'}))
+    assert form.data == {'field1': 1, 'field2': None}
+    assert not form.validate()
+    assert form.errors == {'field2': ['This field is required.']}
+
+    assert form['field3'].data == 3
+    assert len(form._fields.bound) == 3
+    assert form.data == {'field1': 1, 'field2': None, 'field3': 3}
+
+
+def test_lazy_root_validators(person_model, post_data):
+    form = LazyForm.from_model(person_model, only=['identifier', 'age'])
+    form.process(post_data(identifier='admin', age='18'))
+    assert form.validate()
+    assert form.partial
+    assert form.validated == {'identifier': 'admin', 'age': 18}
+    with pytest.raises(ValueError):
+        form.to_model()
+
+    form['name']
+    assert form.validate() is False
+    assert form.errors == {
+        'identifier': ['The identifier must contain the name in lowercase.']
+    }
+
+    form.process(post_data(identifier='admin', age='18', name='admin'))
+    assert form.validate() is False
+    assert form.form_errors == ['You must be over 21 to be an admin.']
+
+    form.process(post_data(identifier='klaus', age='18', name='klaus'))
+    assert form.validate()
+    assert not form.partial
+    assert form.to_model() == person_model(
+        identifier='klaus', age=18, name='klaus')
+
+
+def test_lazy_full_interface(person_model):
+    form = LazyForm.from_model(person_model)
+    assert form._fields.bound == {}
+    form.process(data={'identifier': 'klaus'})
+    assert [field.name for field in form] == ['identifier', 'name', 'age']
+    assert form._fields.complete
+    assert form.data == {'identifier': 'klaus', 'name': 'Klaus', 'age': 18}
+
+
+def test_lazy_validate_field(post_data):
+    form = LazyForm.from_model(Wide)
+    form.process(post_data({'field7': '7'}))
+    assert form.validate_field('field7').valid
+    assert list(form._fields.bound) == ['field7']
@@ -0,0 +1,162 @@
+"""Tests for `wtforms_pydantic` package.
+"""
+
+import typing
+import pydantic
+from wtforms_pydantic import Form
+from wtforms_pydantic.blueprint import blueprints
+from wtforms_pydantic._fields import ModelFormField, ModelFieldList
+from wtforms_pydantic.field import is_recursive
+
+
+class Address(pydantic.BaseModel):
+    street: str
+    city: str = 'Berlin'
+
+
+class Item(pydantic.BaseModel):
+    name: str
+    quantity: int = 1
+
+    @pydantic.validator('quantity')
+    def positive(cls, v):
+        if v < 1:
+            raise ValueError('must be positive.')
+        return v
+
+
+class Order(pydantic.BaseModel):
+    reference: str
+    address: Address
+    billing: typing.Optional[Address]
+    items: typing.List[Item]
+
+
+class Node(pydantic.BaseModel):
+    name: str
+    parent: typing.Optional['Node']
+    children: typing.List['Node'] = []
+
+
+Node.update_forward_refs()
+
+
+def test_nested_fields(post_data):
+    form = Form.from_model(Order)
+    assert isinstance(form['address'], ModelFormField)
+    assert isinstance(form['items'], ModelFieldList)
+
+    form.process(post_data({
+        'reference': 'A-1',
+        'address-street': 'Main street',
+        'billing-0-street': 'Other street',
+        'billing-0-city': 'Bonn',
+        'items-0-name': 'Spam',
+        'items-0-quantity': '2',
+        'items-1-name': 'Eggs',
+    }))
+    assert form.validate(), form.errors
+    assert form.to_model() == Order(
+        reference='A-1',
+        address=Address(street='Main street'),
+        billing=Address(street='Other street', city='Bonn'),
+        items=[Item(name='Spam', quantity=2), Item(name='Eggs')],
+    )
+
+
+def test_nested_errors(post_data):
+    form = Form.from_model(Order)
+    form.process(post_data({
+        'reference': 'A-1',
+        'address-city': 'Bonn',
+        'items-0-name': 'Spam',
+        'items-0-quantity': '0',
+    }))
+    assert not form.validate()
+    assert form.errors == {
+        'address': {'street': ['This field is required.']},
+        'items': [{'quantity': ['must be positive.']}],
+    }
+
+    form.process(post_data({'reference': 'A-1', 'billing-0-city': 'Bonn'}))
+    assert not form.validate()
+    assert form.errors['billing'] == [{'street': ['This field is required.']}]
+
+
+def test_missing_optional_sub_form(post_data):
+    form = Form.from_model(Order)
+    assert isinstance(form['billing'], ModelFieldList)
+    assert form['billing'].scalar
+
+    form.process(post_data({
+        'reference': 'A-1',
+        'address-street': 'Main street',
+        'items-0-name': 'Spam',
+    }))
+    assert form['billing'].data is None
+    assert form.validate(), form.errors
+    assert form.to_model() == Order(
+        reference='A-1', address=Address(street='Main street'),
+        billing=None, items=[Item(name='Spam')])
+
+
+def test_blank_optional_sub_form(post_data):
+    form = Form.from_model(Order)
+    form.process()
+    assert 'name="billing-0-street"' in form['billing']()
+    assert 'name="billing-0-city"' in form['billing']()
+    assert form['billing'].data is None
+
+    form.process(post_data({
+        'reference': 'A-1',
+        'address-street': 'Main street',
+        'billing-0-street': '',
+        'billing-0-city': '',
+        'items-0-name': 'Spam',
+    }))
+    assert form['billing'].blank
+    assert form.validate(), form.errors
+    assert form.to_model().billing is None
+
+    form.process(data={'billing': Address(street='Other street')})
+    assert not form['billing'].blank
+    assert form['billing'].data == {'street': 'Other street', 'city': 'Berlin'}
+
+
+def test_sub_blueprints_are_shared(post_data):
+    form1 = Form.from_model(Order)
+    form2 = Form.from_model(Order)
+    form1.process()
+    form2.process(post_data({'billing-0-street': 'Other street'}))
+    billing = form2['billing'].entries[0]
+    assert form1['address'].form_class == billing.form_class
+    assert form1['address'].form['street'] is not billing.form['street']
+    assert form1['address'].form.model is Address
+    assert (Order, None, None) in blueprints
+    assert (Address, None, None) in blueprints
+
+
+def test_recursive_model(post_data):
+    assert is_recursive(Node)
+    assert not is_recursive(Order)
+
+    form = Form.from_model(Node)
+    assert isinstance(form['parent'], ModelFieldList)
+    assert form['parent'].scalar
+
+    form.process(post_data({'name': 'root'}))
+    assert form['parent'].data is None
+    assert form['children'].data == []
+    assert form.validate(), form.errors
+    assert form.to_model() == Node(name='root')
+
+    form.process(post_data({
+        'name': 'leaf',
+        'parent-0-name': 'root',
+        'children-0-name': 'child',
+        'children-0-children-0-name': 'grandchild',
+    }))
+    assert form.validate(), form.errors
+    assert form.to_model() == Node(
+        name='leaf', parent=Node(name='root'), children=[
+            Node(name='child', children=[Node(name='grandchild')])])
@@ -1,7 +1,9 @@
 """Tests for `wtforms_pydantic` package.
 """
 
+import decimal
 import hamcrest
+import pydantic
 import pytest
 import wtforms.fields
 import wtforms.validators
@@ -74,8 +76,7 @@ def test_field_options(person_model):
         })
     )
 
-    field = Field(person_model.__fields__['name'])
-    field.required = True
+    field = Field(person_model.__fields__['name']).replace(required=True)
     options = field.compute_options()
     hamcrest.assert_that(options, hamcrest.has_entries({
             'default': 'Klaus',
@@ -89,7 +90,8 @@ def test_field_options(person_model):
     )
 
     field = Field(person_model.__fields__['name'])
-    field.metadata['label'] = "This is a name"
+    field = field.replace(
+        metadata={**field.metadata, 'label': "This is a name"})
     options = field.compute_options()
     hamcrest.assert_that(options, hamcrest.has_entries({
             'default': 'Klaus',
@@ -146,3 +148,71 @@ def test_typing_rich_field_options(userinfo_model):
             'label': 'email'
         })
     )
+
+
+def test_options_template(person_model):
+    field = Field(person_model.__fields__['name'])
+    options = field.compute_options()
+    assert field.compute_options() is options
+    with pytest.raises(TypeError):
+        options['label'] = 'Name'
+
+    other = Field(person_model.__fields__['identifier']).compute_options()
+    assert options['validators'][0] is Field(
+        person_model.__fields__['age']).compute_options()['validators'][0]
+    assert other['validators'][0] is Field(
+        person_model.__fields__['identifier']).compute_options()[
+            'validators'][0]
+
+    overridden = field.compute_options(label='Name')
+    assert overridden['label'] == 'Name'
+    assert overridden['validators'] is options['validators']
+    assert field.compute_options() is options
+
+    changed = field.replace(
+        metadata={**field.metadata, 'description': 'The name'})
+    assert changed.compute_options() is not options
+    assert changed.compute_options()['description'] == 'The name'
+    assert field.compute_options() is options
+
+
+def test_field_is_immutable(person_model):
+    field = Field(person_model.__fields__['name'])
+    with pytest.raises(AttributeError):
+        field.required = True
+    with pytest.raises(AttributeError):
+        field.validator.field = None
+    with pytest.raises(TypeError):
+        field.metadata['label'] = 'Name'
+    with pytest.raises(TypeError):
+        field.replace(color='red')
+
+    required = field.replace(required=True)
+    assert required.required and not field.required
+    assert required.validator is field.validator
+    assert required.kind is field.kind
+
+
+def test_fields_are_shared(person_model, userinfo_model):
+    name = Field(person_model.__fields__['name'])
+    identifier = Field(person_model.__fields__['identifier'])
+    email = Field(userinfo_model.__fields__['email'])
+    assert name.kind is identifier.kind is email.kind
+    assert Field(person_model.__fields__['name']).metadata is name.metadata
+    assert not hasattr(name, '__dict__')
+    assert not hasattr(name.validator, '__dict__')
+
+
+def test_equal_defaults_are_kept_apart():
+    first = pydantic.create_model(
+        'First', price=(decimal.Decimal, decimal.Decimal('1.0')),
+        size=(tuple, (1, 2)))
+    second = pydantic.create_model(
+        'Second', price=(decimal.Decimal, decimal.Decimal('1.00')),
+        size=(tuple, (1.0, 2.0)))
+    assert str(Field(first.__fields__['price']).metadata['default']) == '1.0'
+    assert str(Field(second.__fields__['price']).metadata['default']) == \
+        '1.00'
+    assert Field(second.__fields__['size']).metadata['default'] == (1.0, 2.0)
+    assert type(
+        Field(second.__fields__['size']).metadata['default'][0]) is float
@@ -0,0 +1,110 @@
+"""Tests for `wtforms_pydantic` package.
+"""
+
+import enum
+import io
+import typing
+import pytest
+import pydantic
+from wtforms_pydantic import Form, LazyForm, PayloadTooLarge
+from wtforms_pydantic.stream import ingest
+
+
+class Tag(enum.Enum):
+    a = 'A'
+    b = 'B'
+
+
+class Address(pydantic.BaseModel):
+    city: str
+
+
+class Message(pydantic.BaseModel):
+    subject: str
+    body: str
+    tags: typing.List[Tag] = []
+    address: Address
+
+
+def test_ingest():
+    data = ingest(['subject', 'tags', 'address'], [
+        ('subject', b'Hello'),
+        ('unknown', 'dropped'),
+        ('tags', 'a'),
+        ('tags', 'b'),
+        ('address-city', 'Paris'),
+        ('addressbook', 'dropped'),
+    ])
+    assert data == {
+        'subject': ['Hello'], 'tags': ['a', 'b'], 'address-city': ['Paris']}
+    assert data.getlist('tags') == ['a', 'b']
+
+
+def test_limits():
+    consumed = []
+
+    def pairs():
+        for i in range(1000):
+            consumed.append(i)
+            yield 'tags', str(i)
+
+    with pytest.raises(PayloadTooLarge):
+        ingest(['tags'], pairs(), max_field_values=10)
+    assert len(consumed) == 11
+
+    with pytest.raises(PayloadTooLarge):
+        ingest(['body'], [('body', 'x' * 101)], max_value_size=100)
+
+    with pytest.raises(PayloadTooLarge):
+        ingest(['body', 'subject'],
+               [('subject', 'x' * 60), ('unknown', 'x' * 60),
+                ('body', 'x' * 60)], max_payload_size=100)
+
+
+def test_unknown_names_are_not_kept():
+    consumed = []
+
+    def pairs():
+        for i in range(10000):
+            consumed.append(i)
+            yield f'junk{i}', 'x'
+
+    assert ingest(['body'], pairs(), max_payload_size=100) == {}
+    assert len(consumed) == 10000
+
+
+def test_uploads():
+    class Upload:
+        content_length = 50
+
+    upload = Upload()
+    stream = io.BytesIO(b'x' * 80)
+    stream.seek(10)
+    data = ingest(['files'], [('files', upload), ('files', stream)],
+                  max_value_size=70, max_payload_size=200)
+    assert data.getlist('files') == [upload, stream]
+    assert stream.tell() == 10
+
+    with pytest.raises(PayloadTooLarge):
+        ingest(['files'], [('files', io.BytesIO(b'x' * 80))],
+               max_value_size=70)
+    with pytest.raises(PayloadTooLarge):
+        ingest(['files'], [('files', upload), ('files', upload)],
+               max_payload_size=70)
+
+
+@pytest.mark.parametrize('form_class', [Form, LazyForm])
+def test_process_stream(form_class):
+    form = form_class.from_model(Message)
+    form.max_field_values = 3
+    form.process_stream(iter([
+        ('subject', 'Hi'), ('body', b'Some text'), ('tags', 'a'),
+        ('tags', 'b'), ('address-city', 'Paris'), ('spam', 'x'),
+    ]))
+    assert form['subject'].data == 'Hi'
+    assert form['body'].data == 'Some text'
+    assert form['tags'].data == [Tag.a, Tag.b]
+    assert form['address'].form['city'].data == 'Paris'
+
+    with pytest.raises(PayloadTooLarge):
+        form.process_stream(('tags', 'x') for i in range(10))
@@ -0,0 +1,133 @@
+"""Tests for `wtforms_pydantic` package.
+"""
+
+import enum
+import gc
+import sys
+import threading
+import time
+import typing
+import pytest
+import pydantic
+import wtforms_pydantic.blueprint
+from concurrent.futures import ThreadPoolExecutor
+from wtforms_pydantic import Form, compile_model, blueprints
+
+
+class Level(enum.Enum):
+    low = 'Low'
+    high = 'High'
+
+
+class Ticket(pydantic.BaseModel):
+    title: str
+    priority: int
+    level: Level
+    levels: typing.List[Level] = []
+
+    @pydantic.validator('priority')
+    def positive(cls, v):
+        if v < 0:
+            raise ValueError('Must be positive.')
+        return v
+
+
+def test_blueprint_is_immutable():
+    blueprint = compile_model(Ticket)
+    with pytest.raises(AttributeError):
+        blueprint.unbound = ()
+    with pytest.raises(TypeError):
+        blueprint.fields['title'] = None
+    with pytest.raises(TypeError):
+        blueprint.unbound_fields['title'] = None
+
+
+def test_single_build_under_contention(monkeypatch, post_data):
+    builds = []
+    model_fields = wtforms_pydantic.blueprint.model_fields
+
+    def slow_model_fields(model, **kwargs):
+        builds.append(model)
+        time.sleep(0.05)
+        return model_fields(model, **kwargs)
+
+    monkeypatch.setattr(
+        wtforms_pydantic.blueprint, 'model_fields', slow_model_fields)
+    blueprints.invalidate(Ticket)
+
+    threads = 16
+    barrier = threading.Barrier(threads)
+    submissions = [
+        ({'title': f'Ticket {i}', 'priority': str(i if i >= 8 else -i - 1),
+          'level': 'high', 'levels': ['low', 'high']}, i >= 8)
+        for i in range(threads * 20)
+    ]
+
+    def work(chunk):
+        barrier.wait()
+        results = []
+        for data, expected in chunk:
+            form = Form.from_model(Ticket)
+            form.process(post_data(data))
+            valid = form.validate()
+            results.append(valid == expected)
+            if valid:
+                ticket = form.to_model()
+                results.append(ticket.title == data['title'])
+                results.append(ticket.levels == [Level.low, Level.high])
+            else:
+                results.append(
+                    form.errors == {'priority': ['Must be positive.']})
+            results.append(form.form_errors == [])
+        return results
+
+    chunks = [submissions[i::threads] for i in range(threads)]
+    with ThreadPoolExecutor(threads) as executor:
+        results = [
+            ok for chunk in executor.map(work, chunks) for ok in chunk]
+
+    assert builds == [Ticket]
+    assert len(results) == 8 * 3 + (threads * 20 - 8) * 4
+    assert all(results)
+
+
+def test_hits_while_models_are_collected():
+    models = [
+        pydantic.create_model(f'Cached{i}', title=(str, ...))
+        for i in range(500)]
+    for model in models:
+        compile_model(model)
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        try:
+            while not stop.is_set():
+                for model in models:
+                    Form.from_model(model)
+        except Exception as exc:
+            errors.append(exc)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    try:
+        for i in range(30):
+            tenants = [
+                pydantic.create_model(f'Tenant{i}', name=(str, ...))
+                for _ in range(5)]
+            for tenant in tenants:
+                Form.from_model(tenant)
+            del tenants, tenant
+            gc.collect()
+            len(blueprints)
+    finally:
+        stop.set()
+        for thread in readers:
+            thread.join()
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    assert all((model, None, None) in blueprints for model in models)